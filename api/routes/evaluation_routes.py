@@ -1,9 +1,22 @@
 ﻿# -*- coding: utf-8 -*-
 from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from typing import List, Optional
 from pydantic import BaseModel
+from services.batch_encoder import BatchEncoder
+from services.embedding_cache import embedding_cache
+from services.evaluation_pool import EvaluationPoolBusy, evaluation_pool
+from services.evaluation_service import EvaluationService
+from services.model_registry import model_registry
+from services.question_bank import get_question_bank
+from services.session_scoring import session_scores
+from services.session_store import expand_answers, session_store
 
 router = APIRouter()
+evaluation_service = EvaluationService()
+# Encoding runs on the batcher's worker thread, off the event loop
+batch_encoder = BatchEncoder(evaluation_service.encode_texts)
 
 class EvaluationResponse(BaseModel):
     score: float  # Score out of 100
@@ -25,12 +38,135 @@ class EvaluationResponse(BaseModel):
     }
 
 @router.post("/evaluation/evaluate")
-async def evaluate_answers(answers: List[dict]):
-    """Evaluate answers and return score out of 100"""
-    evaluation_service = EvaluationService()
-    result = evaluation_service.evaluate_answers(answers)
+async def evaluate_answers(answers: List[dict], test_id: Optional[str] = None):
+    """Evaluate answers and return score out of 100.
+
+    Answers may carry just question_id and answer; the question text and keywords come
+    from the bank. With a test_id, send only answers not submitted before: the whole
+    session's answers are evaluated.
+    """
+    try:
+        if test_id:
+            # The session store may read SQLite; keep that off the event loop
+            answers = await run_in_threadpool(_session_answers, test_id, answers)
+        else:
+            answers = expand_answers(answers, get_question_bank())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if evaluation_pool.enabled:
+        try:
+            result = await evaluation_pool.evaluate_answers(answers)
+        except EvaluationPoolBusy:
+            # Overloaded: answer from the model-free lexical tier instead of queueing
+            result = evaluation_service.evaluate_answers_lexical(answers)
+    else:
+        result = await evaluation_service.evaluate_answers_async(answers, batch_encoder)
     
     # Convert score to 100-point scale
     result['score'] = result['score'] * 100
     
-    return result 
\ No newline at end of file
+    return result
+
+@router.post("/evaluation/sessions/{test_id}/answers")
+async def score_answer(test_id: str, answer: dict):
+    """Score one answer as it is submitted and update the session's running score"""
+    try:
+        answer = expand_answers([answer], get_question_bank())[0]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        if evaluation_pool.enabled:
+            try:
+                scores = await evaluation_pool.score_answers([answer])
+            except EvaluationPoolBusy:
+                scores = evaluation_service.lexical_scores([answer])
+        else:
+            scores = await evaluation_service.score_answers_async([answer], batch_encoder)
+        score = float(scores[0])
+    except Exception as e:
+        print(f"Error in score_answer: {str(e)}")
+        # Nothing was recorded, so the client can simply resubmit the answer
+        raise HTTPException(status_code=503, detail="Answer could not be scored, please resubmit it")
+    key = answer.get('question_id') or answer.get('question')
+    if answer.get('question_id'):
+        await run_in_threadpool(_record_answer, test_id, key, answer.get('answer'), score)
+    session = session_scores.record(
+        test_id,
+        key,
+        answer.get('question') or key,
+        answer.get('category', 'general'),
+        score
+    )
+    return {
+        'question_id': answer.get('question_id'),
+        'score': score * 100,
+        'running_score': session.average * 100,
+        'answered': session.answered
+    }
+
+@router.get("/evaluation/sessions/{test_id}")
+async def get_session_evaluation(test_id: str):
+    """Final evaluation built from the running session score, out of 100"""
+    session = session_scores.get(test_id) or await run_in_threadpool(_restore_session_score, test_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"No answers recorded for test {test_id}")
+
+    result = evaluation_service.session_evaluation(session)
+    result['score'] = result['score'] * 100
+    result['category_scores'] = {k: v * 100 for k, v in result['category_scores'].items()}
+    return result
+
+def _session_answers(test_id, answers):
+    """Record new answers in the session store and return every answer of the session, expanded"""
+    bank = get_question_bank()
+    answers = expand_answers(answers, bank)
+    stored = session_store.start(test_id)
+    for answer in answers:
+        question_id = answer.get('question_id')
+        # Re-sending an unchanged answer keeps the score recorded when it was submitted
+        if question_id and stored.answers.get(question_id, (None,))[0] != answer.get('answer'):
+            session_store.record_answer(stored, question_id, answer.get('answer'))
+    # Answers without an id cannot be stored, so they are evaluated from the request only
+    unstored = [answer for answer in answers if not answer.get('question_id')]
+    return expand_answers([
+        {'question_id': question_id, 'answer': text}
+        for question_id, (text, _) in stored.answers.items()
+        if bank.get(question_id) is not None
+    ], bank) + unstored
+
+def _record_answer(test_id, question_id, answer, score):
+    session_store.record_answer(session_store.start(test_id), question_id, answer, score)
+
+def _restore_session_score(test_id):
+    """Rebuild the running score from scored answers in the session store, e.g. after a restart"""
+    stored = session_store.get(test_id)
+    if stored is None:
+        return None
+    bank = get_question_bank()
+    session = None
+    for question_id, (_, score) in stored.answers.items():
+        question = bank.get(question_id)
+        if score is not None and question is not None:
+            session = session_scores.record(test_id, question_id, question['question'], question['category'], score)
+    return session
+
+@router.get("/evaluation/ready")
+async def evaluation_ready():
+    """Report whether the evaluation model is loaded"""
+    if evaluation_pool.enabled:
+        status = evaluation_pool.status()
+    else:
+        status = model_registry.status()
+    return JSONResponse(status_code=200 if status['ready'] else 503, content=status)
+
+@router.get("/evaluation/stats")
+async def evaluation_stats():
+    """Embedding cache counters for monitoring"""
+    return {
+        'embedding_cache': embedding_cache.stats(),
+        'batch_encoder': batch_encoder.stats(),
+        'evaluation_pool': evaluation_pool.status(),
+        'session_store': session_store.status()
+    }
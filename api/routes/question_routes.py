@@ -1,9 +1,17 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
 from pydantic import BaseModel
+from services.category_pages import category_pages
+from services.paper_pool import paper_pool
+from services.question_bank import get_question_bank
+from services.question_bank_watcher import question_bank_watcher
+from services.question_search import question_search
+from services.question_service import QuestionService
 
 router = APIRouter()
+question_service = QuestionService()
 
 class Question(BaseModel):
     id: str
@@ -24,13 +32,124 @@ class Question(BaseModel):
         }
     }
 
+class SearchResult(Question):
+    domain: str
+    score: float
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    results: List[SearchResult]
+
+class WarmPapersRequest(BaseModel):
+    test_ids: List[str] = []  # Expected candidates; their papers are generated and pinned now
+    domain: Optional[str] = None  # Required with test_ids
+    skill_level: Optional[str] = None  # Recorded with the sessions of test_ids
+
+class NextQuestionRequest(BaseModel):
+    test_id: str
+    domain: Optional[str] = None  # Only needed on the first call of a session
+    skill_level: str = 'intermediate'
+    previous_question_id: Optional[str] = None
+    answer: Optional[str] = None
+    score: Optional[float] = None  # 0-1; scored from the answer when omitted
+
+@router.post("/questions/next", response_model=Optional[Question])
+async def get_next_question(request: NextQuestionRequest):
+    """Adaptive next question; null once the interview is complete"""
+    try:
+        # Session reads may hit SQLite, so the adaptive step runs in the threadpool
+        return await run_in_threadpool(
+            question_service.get_next_question,
+            request.previous_question_id,
+            request.answer,
+            test_id=request.test_id,
+            domain=request.domain,
+            skill_level=request.skill_level,
+            score=request.score
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Declared before /questions/{domain}/{skill_level}, which would otherwise match it
+@router.get("/questions/bank/status")
+async def get_question_bank_status():
+    """Question bank version and reload timings for monitoring"""
+    return question_bank_watcher.status()
+
+@router.get("/questions/papers/status")
+async def get_paper_pool_status():
+    """Pre-generated paper counts and cache hit rate"""
+    return paper_pool.status()
+
+@router.post("/questions/papers/warm")
+def warm_paper_pool(request: Optional[WarmPapersRequest] = None):
+    """Top up the spare papers, and pin the papers of expected test_ids, e.g. ahead of an assessment window"""
+    pinned = 0
+    if request is not None and request.test_ids:
+        if not request.domain:
+            raise HTTPException(status_code=400, detail="domain is required with test_ids")
+        pinned = paper_pool.pin(request.test_ids, request.domain, request.skill_level)
+    return {'generated': paper_pool.warm(), 'pinned': pinned, **paper_pool.status()}
+
+@router.get("/questions/search", response_model=SearchResponse)
+async def search_questions(q: str, domain: Optional[str] = None, difficulty: Optional[str] = None,
+                           limit: int = Query(20, ge=1, le=200), offset: int = Query(0, ge=0)):
+    """Full-text search over question text and keywords: terms, prefix* and "exact phrases", all required"""
+    bank = get_question_bank()
+    if domain is not None:
+        resolved = bank.resolve_domain(domain)
+        if resolved is None:
+            raise HTTPException(status_code=400, detail=f"Unknown domain {domain!r}")
+        domain = resolved
+    try:
+        total, matches = question_search.get(bank).search(q, domain, difficulty, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        'query': q,
+        'total': total,
+        'results': [{**question, 'score': round(score, 4)} for score, question in matches]
+    }
+
+@router.get("/questions/category/{category}")
+async def get_questions_by_category(category: str, request: Request, page: int = Query(1, ge=1)):
+    """One page of a category's questions, pre-serialized per bank version; honours If-None-Match"""
+    cached = category_pages.get(get_question_bank()).page(category, page)
+    if cached is None:
+        raise HTTPException(status_code=404, detail=f"No page {page} for category {category!r}")
+
+    use_gzip = _accepts_gzip(request.headers.get('accept-encoding', ''))
+    etag = cached.gzip_etag if use_gzip else cached.etag
+    headers = {'ETag': etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+    if _etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+        return Response(cached.gzip_body, media_type='application/json', headers=headers)
+    return Response(cached.body, media_type='application/json', headers=headers)
+
 @router.get("/questions/{domain}/{skill_level}",
            response_model=List[Question])
-async def get_questions(domain: str, skill_level: str):
-    """Get 15 questions based on domain and skill level"""
+async def get_questions(domain: str, skill_level: str, test_id: Optional[str] = None):
+    """Get 15 questions based on domain and skill level; the same test_id always gets the same paper"""
     try:
-        question_service = QuestionService()
-        questions = question_service.get_questions_for_interview(domain, skill_level)
-        return questions
+        # With a test_id the paper is recorded in the session store, so later evaluation
+        # calls can send question ids instead of question texts
+        return await run_in_threadpool(paper_pool.paper, domain, skill_level, test_id)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _accepts_gzip(accept_encoding):
+    for coding in accept_encoding.lower().split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip() in ('gzip', '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    # If-None-Match uses weak comparison, so a W/ prefix still matches
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in tags)
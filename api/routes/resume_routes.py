@@ -1,14 +1,23 @@
 # -*- coding: utf-8 -*-
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Dict, List, Optional
+import json
 import logging
 import os
+import tempfile
+import zipfile
 from api.models.resume import ResumeResponse
+from config import Config
+from services.resume_cache import resume_cache
+from services.resume_ingest import ArchiveTooLarge, ResumeIngest, check_archive, zip_files
+from services.resume_pool import ResumeParseCancelled, ResumeParseTimeout, ResumePoolBusy, bulk_resume_pool, resume_pool
 from services.resume_service import ResumeService
 from models.candidate import Candidate, Domain
 from services.photo_service import PhotoService
 from services.id_service import IDService
+from services.upload_service import UploadTooLarge, upload_service
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -27,6 +36,7 @@ ALLOWED_MIME_TYPES = {
 resume_service = ResumeService()
 photo_service = PhotoService()
 id_service = IDService()
+resume_ingest = ResumeIngest(resume_service)
 
 @router.post(
     "/resume/upload",
@@ -35,6 +45,7 @@ id_service = IDService()
     description="Upload and parse a resume file (PDF, DOC, or DOCX)"
 )
 async def upload_resume(
+    request: Request,
     resume: UploadFile = File(
         ...,
         description="Resume file (PDF, DOC, or DOCX)",
@@ -63,31 +74,16 @@ async def upload_resume(
                 detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             )
 
-        # Check file size (5MB limit)
-        content = await resume.read()
-        if len(content) > 5 * 1024 * 1024:  # 5MB
-            raise HTTPException(
-                status_code=400,
-                detail="File size too large. Maximum size is 5MB"
-            )
-
-        # Reset file pointer
-        await resume.seek(0)
-        
         logger.info(f"Processing file: {resume.filename} ({file_ext})")
 
         try:
-            # Parse resume
-            parsed_data = resume_service.parse_resume(resume.file)
-            
-            # Determine domain based on skills
-            domain = resume_service.determine_domain(parsed_data['skills'])
-            
-            # Determine skill level based on experience and skills
-            skill_level = resume_service.determine_skill_level(
-                parsed_data['experience'],
-                parsed_data['skills']
-            )
+            try:
+                analysis = await resume_ingest.analyze(resume.file, resume.filename, request)
+            except UploadTooLarge as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            parsed_data = analysis['parsed']
+            domain = analysis['domain']
+            skill_level = analysis['skill_level']
 
             # Create and validate response
             response = ResumeResponse(
@@ -101,6 +97,10 @@ async def upload_resume(
             logger.info(f"Successfully processed resume. Domain: {domain}, Level: {skill_level}")
             return response
 
+        except HTTPException:
+            raise
+        except (ResumePoolBusy, ResumeParseTimeout, ResumeParseCancelled) as e:
+            raise _parse_error(e)
         except Exception as e:
             logger.error(f"Error processing resume content: {str(e)}")
             raise HTTPException(
@@ -108,6 +108,8 @@ async def upload_resume(
                 detail=f"Error processing resume: {str(e)}"
             )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Upload error: {str(e)}")
         raise HTTPException(
@@ -163,6 +165,7 @@ def parse_resume_text(text: str) -> Dict[str, List[str]]:
 
 @router.post("/register")
 async def register_candidate(
+    request: Request,
     name: str = Form(...),
     father_name: str = Form(...),
     email: str = Form(...),
@@ -171,14 +174,14 @@ async def register_candidate(
     photo: UploadFile = File(...)
 ):
     try:
-        # Process resume
-        resume_content = await resume.read()
-        resume_path = resume_service.save_resume(resume_content, resume.filename)
-        parsed_resume = resume_service.parse_resume(resume_path)
+        # Process resume; a file seen before is not stored or parsed again
+        analysis = await resume_ingest.analyze(resume.file, resume.filename, request)
+        resume_path = analysis['path']
+        parsed_resume = analysis['parsed']
 
-        # Process photo
-        photo_content = await photo.read()
-        photo_path = photo_service.save_photo(photo_content)
+        # Process photo straight from the upload's spooled file
+        await run_in_threadpool(upload_service.scan, photo.file, Config.MAX_CONTENT_LENGTH)
+        photo_path = await run_in_threadpool(photo_service.save_photo, photo.file)
 
         # Generate IDs
         candidate_id = id_service.generate_candidate_id()
@@ -209,8 +212,59 @@ async def register_candidate(
             }
         )
 
+    except (ResumePoolBusy, ResumeParseTimeout, ResumeParseCancelled) as e:
+        raise _parse_error(e)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/resume/bulk")
+async def upload_resumes_bulk(
+    archive: UploadFile = File(..., description="Zip archive of PDF, DOC and DOCX resumes")
+):
+    """Parse every resume in a zip archive across all cores, streaming one NDJSON line per file as it finishes"""
+    # FastAPI closes the upload once this handler returns, before the stream is sent
+    archive_file = tempfile.TemporaryFile()
+    try:
+        await run_in_threadpool(upload_service.copy, archive.file, archive_file, Config.MAX_BULK_BYTES)
+        zip_archive = zipfile.ZipFile(archive_file)
+    except UploadTooLarge as e:
+        archive_file.close()
+        raise HTTPException(status_code=413, detail=str(e))
+    except (zipfile.BadZipFile, ValueError):
+        archive_file.close()
+        raise HTTPException(status_code=400, detail="Upload is not a valid zip archive")
+
+    try:
+        check_archive(zip_archive)
+    except ArchiveTooLarge as e:
+        zip_archive.close()
+        archive_file.close()
+        raise HTTPException(status_code=413, detail=str(e))
+
+    async def results():
+        # StreamingResponse cancels this generator when the client disconnects,
+        # which cancels every parse still running
+        try:
+            async for result in resume_ingest.analyze_many(zip_files(zip_archive)):
+                yield json.dumps(result) + "\n"
+        finally:
+            zip_archive.close()
+            archive_file.close()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.get("/resume/parser/status")
+async def get_resume_parser_status():
+    """Resume parse queue depth, outcome counters and parse cache hits for monitoring"""
+    return {**resume_pool.status(), 'bulk': bulk_resume_pool.status(), 'cache': resume_cache.status()}
+
+def _parse_error(e):
+    if isinstance(e, ResumePoolBusy):
+        return HTTPException(status_code=503, detail=str(e), headers={'Retry-After': '1'})
+    if isinstance(e, ResumeParseTimeout):
+        return HTTPException(status_code=504, detail=str(e))
+    # 499: the client closed the request; nobody reads this response
+    return HTTPException(status_code=499, detail=str(e))
             
\ No newline at end of file
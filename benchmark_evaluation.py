@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import numpy as np
+from config import Config
+from services.batch_encoder import BatchEncoder
+from services.embedding_cache import EmbeddingCache
+from services.encoders import BACKENDS
+from services.evaluation_service import EvaluationService
+from services.model_registry import ModelRegistry
+from services.question_bank import QuestionBank
+
+MODES = ('single', 'batched', 'concurrent')
+FILLER = "the a it we this because when then also which usually in practice for example so".split()
+
+def synthetic_answers(questions, count, answer_length, rng):
+    """Answers to real questions, mixing some expected keywords with filler up to answer_length words"""
+    answers = []
+    for question in rng.sample(questions, count):
+        keywords = question['expected_keywords']
+        words = rng.sample(keywords, rng.randint(0, len(keywords))) if keywords else []
+        words += rng.choices(FILLER, k=max(answer_length - len(words), 0))
+        rng.shuffle(words)
+        answers.append({
+            'question_id': question['id'],
+            'question': question['question'],
+            'answer': ' '.join(words[:answer_length]),
+            'expected_keywords': question['expected_keywords']
+        })
+    return answers
+
+class CountingEvaluationService(EvaluationService):
+    """EvaluationService that counts answers scored by the lexical fallback after an error,
+    so a broken encoder does not pass for a fast one"""
+
+    fallbacks = 0
+
+    def _fallback_evaluation(self, answers):
+        self.fallbacks += len(answers)
+        return super()._fallback_evaluation(answers)
+
+def peak_rss_mb():
+    """Peak RSS of this process so far; each configuration runs in its own process"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def summarize(latencies, answers, seconds):
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        'calls': len(latencies),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'answers_per_second': answers / seconds if seconds else None
+    }
+
+def run_single(service, answer_sets, concurrency=None):
+    """One evaluate_answers call per answer"""
+    latencies = []
+    started = time.perf_counter()
+    for answers in answer_sets:
+        for answer in answers:
+            call_started = time.perf_counter()
+            service.evaluate_answers([answer])
+            latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, sum(map(len, answer_sets)), time.perf_counter() - started)
+
+def run_batched(service, answer_sets, concurrency=None):
+    """One evaluate_answers call per answer set"""
+    latencies = []
+    started = time.perf_counter()
+    for answers in answer_sets:
+        call_started = time.perf_counter()
+        service.evaluate_answers(answers)
+        latencies.append(time.perf_counter() - call_started)
+    return summarize(latencies, sum(map(len, answer_sets)), time.perf_counter() - started)
+
+def run_concurrent(service, answer_sets, concurrency):
+    """Answer sets evaluated by concurrent async callers sharing one BatchEncoder"""
+    batch_encoder = BatchEncoder(service.encode_texts)
+    latencies = []
+
+    async def worker(queue):
+        while queue:
+            answers = queue.pop()
+            call_started = time.perf_counter()
+            await service.evaluate_answers_async(answers, batch_encoder)
+            latencies.append(time.perf_counter() - call_started)
+
+    async def main():
+        queue = list(answer_sets)
+        await asyncio.gather(*[worker(queue) for _ in range(concurrency)])
+
+    started = time.perf_counter()
+    asyncio.run(main())
+    seconds = time.perf_counter() - started
+    batch_encoder.stop()
+    result = summarize(latencies, sum(map(len, answer_sets)), seconds)
+    result['encoder_batches'] = batch_encoder.batches
+    return result
+
+RUNS = {'single': run_single, 'batched': run_batched, 'concurrent': run_concurrent}
+
+def run_configuration(backend, mode, batch_size, answer_length, iterations, concurrency, use_cache, seed,
+                      evaluation_mode=Config.EVALUATION_MODE):
+    """Benchmark one configuration in the current process"""
+    registry = ModelRegistry(backend=backend)
+    if registry.load() is None:
+        raise SystemExit(f"Could not load {backend} encoder: {registry.error}")
+
+    cache = EmbeddingCache(max_bytes=Config.EMBEDDING_CACHE_MAX_BYTES if use_cache else 0)
+    service = CountingEvaluationService(registry, cache=cache, mode=evaluation_mode)
+    questions = list(QuestionBank.load().questions)
+    # Seeded per size and length, so every mode gets the same answer sets
+    rng = random.Random(f"{seed}:{batch_size}:{answer_length}")
+    answer_sets = [synthetic_answers(questions, batch_size, answer_length, rng) for _ in range(iterations)]
+
+    baseline_rss = peak_rss_mb()
+    result = RUNS[mode](service, answer_sets, concurrency)
+    peak_rss = peak_rss_mb()
+    result.update({
+        'mode': mode,
+        'batch_size': batch_size,
+        'answer_length': answer_length,
+        'load_seconds': registry.load_seconds,
+        'keyword_store': service.keyword_store is not None,
+        'fallback_answers': service.fallbacks,
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': peak_rss,
+        'rss_growth_mb': peak_rss - baseline_rss if peak_rss is not None else None
+    })
+    return result
+
+def run_benchmark(backend, batch_sizes, answer_lengths, iterations, concurrency, use_cache, seed,
+                  evaluation_mode=Config.EVALUATION_MODE):
+    """Every configuration in a fresh process, so peak RSS belongs to that configuration alone"""
+    report = {
+        'backend': backend,
+        'evaluation_mode': evaluation_mode,
+        'model': ModelRegistry(backend=backend).model_name,
+        'cache': use_cache,
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'results': []
+    }
+    for answer_length in answer_lengths:
+        for batch_size in batch_sizes:
+            for mode in MODES:
+                configuration = {
+                    'backend': backend, 'mode': mode, 'batch_size': batch_size, 'answer_length': answer_length,
+                    'iterations': iterations, 'concurrency': concurrency, 'use_cache': use_cache, 'seed': seed,
+                    'evaluation_mode': evaluation_mode
+                }
+                completed = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--configuration', json.dumps(configuration)],
+                    stdout=subprocess.PIPE, text=True
+                )
+                if completed.returncode != 0:
+                    raise SystemExit(f"Configuration {configuration} failed with exit code {completed.returncode}")
+                result = json.loads(completed.stdout)
+                report['results'].append(result)
+                print(f"{mode:>10} batch={batch_size:<4} words={answer_length:<4} "
+                      f"p50={result['p50_ms']:.1f}ms answers/s={result['answers_per_second']:.1f} "
+                      f"peak_rss={result['peak_rss_mb']}MB fallbacks={result['fallback_answers']}",
+                      file=sys.stderr)
+                if result['fallback_answers']:
+                    print(f"Warning: {result['fallback_answers']} answers fell back to lexical scoring, "
+                          f"this row does not measure the {backend} encoder", file=sys.stderr)
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark EvaluationService latency and throughput")
+    parser.add_argument('--backend', default=Config.ENCODER_BACKEND, choices=BACKENDS)
+    parser.add_argument('--evaluation-mode', default=Config.EVALUATION_MODE, choices=['embedding', 'lexical', 'tiered'])
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=[1, 5, 15, 50])
+    parser.add_argument('--answer-lengths', nargs='+', type=int, default=[10, 50, 200], help="Words per answer")
+    parser.add_argument('--iterations', type=int, default=20, help="Answer sets per configuration")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--cache', action='store_true', help="Keep the embedding cache enabled")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--configuration', help=argparse.SUPPRESS)  # One configuration as JSON, run by run_benchmark
+    args = parser.parse_args()
+
+    if args.configuration:
+        # Services print their warnings; stdout carries only the result
+        with contextlib.redirect_stdout(sys.stderr):
+            result = run_configuration(**json.loads(args.configuration))
+        print(json.dumps(result))
+        sys.exit(0)
+
+    report = run_benchmark(args.backend, args.batch_sizes, args.answer_lengths, args.iterations,
+                           args.concurrency, args.cache, args.seed, args.evaluation_mode)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
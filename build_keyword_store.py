@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from config import Config
+from services.keyword_store import KeywordStore
+from services.model_registry import model_registry
+from services.question_bank import QuestionBank, validate_questions
+
+def build_keyword_store():
+    print(f"Encoding question bank keywords with {model_registry.model_id}...")
+    model = model_registry.load()
+    if model is None:
+        raise SystemExit("Model could not be loaded, keyword store not built")
+
+    try:
+        # A malformed question file fails the build instead of being skipped
+        bank = QuestionBank(validate_questions())
+    except ValueError as e:
+        raise SystemExit(str(e))
+    keyword_count, question_count = KeywordStore.build(model, model_registry.model_id, bank.questions,
+                                                       fingerprint=bank.fingerprint)
+    print(f"Wrote {keyword_count} keywords for {question_count} questions to {Config.KEYWORD_STORE_DIR}")
+
+if __name__ == "__main__":
+    build_keyword_store()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import json
+from pathlib import Path
+import numpy as np
+from config import Config
+from services.model_registry import model_registry
+from services.question_bank import QuestionBank, validate_questions
+
+def _find(parents, i):
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+def cluster_questions(questions, vectors, threshold):
+    """question id -> id of the first question in its near-duplicate group"""
+    parents = list(range(len(questions)))
+    similarities = vectors @ vectors.T
+    for i, j in zip(*np.nonzero(np.triu(similarities >= threshold, k=1))):
+        a, b = _find(parents, i), _find(parents, j)
+        if a != b:
+            parents[max(a, b)] = min(a, b)
+    return {q['id']: questions[_find(parents, i)]['id'] for i, q in enumerate(questions)}
+
+def build_question_clusters(threshold=Config.QUESTION_DUPLICATE_THRESHOLD, path=Config.QUESTION_CLUSTERS_PATH):
+    print(f"Encoding question texts with {model_registry.model_id}...")
+    model = model_registry.load()
+    if model is None:
+        raise SystemExit("Model could not be loaded, question clusters not built")
+
+    try:
+        # A malformed question file fails the build instead of being skipped
+        bank = QuestionBank(validate_questions())
+    except ValueError as e:
+        raise SystemExit(str(e))
+    clusters = {}
+    for domain, questions in bank.by_domain.items():
+        vectors = np.asarray(model.encode([q['question'] for q in questions]), dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        # Papers are drawn from one domain, so duplicates only matter within it
+        clusters.update(cluster_questions(questions, vectors, threshold))
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'model': model_registry.model_id,
+            'threshold': threshold,
+            'fingerprint': bank.fingerprint,
+            'clusters': clusters
+        }, f)
+
+    duplicates = sum(1 for qid, cluster in clusters.items() if qid != cluster)
+    print(f"Grouped {duplicates} near-duplicate questions into {len(set(clusters.values()))} clusters in {path}")
+
+if __name__ == "__main__":
+    build_question_clusters()
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import sys
+from config import Config
+from services.question_snapshot import build_snapshot
+
+def build_question_snapshot():
+    try:
+        question_count, string_count = build_snapshot()
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+    print(f"Wrote {question_count} questions ({string_count} unique strings) to {Config.QUESTION_SNAPSHOT_PATH}")
+
+if __name__ == "__main__":
+    build_question_snapshot()
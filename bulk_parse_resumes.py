@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+import argparse
+import asyncio
+import json
+import sys
+from services.resume_ingest import ResumeIngest, open_batch
+from services.resume_pool import ResumePool
+
+async def bulk_parse_resumes(path, workers=None):
+    files, archive = open_batch(path)
+    pool = ResumePool(executor='process', workers=workers) if workers else None
+    ingest = ResumeIngest(bulk_pool=pool)
+    failed = 0
+    try:
+        async for result in ingest.analyze_many(files):
+            failed += 'error' in result
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        ingest.bulk_pool.shutdown()
+        if archive is not None:
+            archive.close()
+    print(f"Parsed {len(files) - failed} of {len(files)} files, {failed} failed", file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse a zip archive or directory of resumes, one NDJSON line per file")
+    parser.add_argument("path", help="Zip archive or directory of PDF, DOC and DOCX resumes")
+    parser.add_argument("--workers", type=int, default=None, help="Parser processes (default: RESUME_BULK_WORKERS)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(bulk_parse_resumes(args.path, args.workers))
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import argparse
+import json
+import time
+import numpy as np
+from services.embedding_cache import EmbeddingCache
+from services.encoders import BACKENDS
+from services.evaluation_service import EvaluationService
+from services.model_registry import ModelRegistry
+from services.question_bank import QuestionBank
+
+def check_parity(backends=BACKENDS, reference='torch', limit=None):
+    """Score the bundled question bank with each backend and report drift against the reference"""
+    # Each question's own text stands in for the candidate's answer
+    answers = [
+        {'question': q['question'], 'answer': q['question'], 'expected_keywords': q['expected_keywords']}
+        for q in QuestionBank.load().questions
+    ][:limit]
+
+    report = {'questions': len(answers), 'reference': reference, 'backends': {}}
+    scores = {}
+    for backend in backends:
+        registry = ModelRegistry(backend=backend)
+        if registry.load() is None:
+            report['backends'][backend] = {'error': registry.error}
+            continue
+
+        service = EvaluationService(registry, cache=EmbeddingCache(max_bytes=0), mode='embedding')
+        started = time.perf_counter()
+        scores[backend] = service._score_answers(answers)
+        report['backends'][backend] = {
+            'load_seconds': registry.load_seconds,
+            'score_seconds': time.perf_counter() - started,
+            'mean_score': float(np.mean(scores[backend]))
+        }
+
+    if reference in scores:
+        for backend, backend_scores in scores.items():
+            drift = np.abs(backend_scores - scores[reference])
+            report['backends'][backend].update({
+                'mean_abs_drift': float(np.mean(drift)),
+                'p95_abs_drift': float(np.percentile(drift, 95)),
+                'max_abs_drift': float(np.max(drift)),
+                'points_over_0.05': int(np.sum(drift > 0.05))
+            })
+
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare evaluation scores across encoder backends")
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument('--reference', default='torch', choices=BACKENDS)
+    parser.add_argument('--limit', type=int, default=None, help="Only score the first N questions")
+    args = parser.parse_args()
+    print(json.dumps(check_parity(args.backends, args.reference, args.limit), indent=2))
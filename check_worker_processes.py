@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import sys
+from services.resume_pool import ResumePool
+from services.worker_processes import describe_worker
+
+def check_worker_processes(workers=2):
+    """Start a process-mode resume pool and fail unless every worker ran services.resume_worker as __main__"""
+    pool = ResumePool(executor='process', workers=workers)
+    pool.start()
+    try:
+        # Enough slow probes that every worker answers at least one
+        probes = [pool._executor.submit(describe_worker, 0.05) for _ in range(workers * 10)]
+        reports = {pid: (main, app_modules) for pid, main, app_modules in (p.result() for p in probes)}
+    finally:
+        pool.shutdown()
+
+    failed = False
+    for pid, (main, app_modules) in sorted(reports.items()):
+        ok = main == 'services.resume_worker' and not app_modules
+        failed = failed or not ok
+        print(f"worker {pid}: __main__={main} app modules={app_modules or 'none'} {'ok' if ok else 'FAILED'}")
+    if failed or len(reports) < workers:
+        print(f"Workers re-imported the launching script or the app ({len(reports)} of {workers} answered)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    check_worker_processes()
@@ -5,4 +5,52 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key-here'
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'} 
\ No newline at end of file
+    MAX_RESUME_SIZE = 5 * 1024 * 1024  # 5MB max resume size
+    ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
+
+    # Evaluation
+    EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL') or 'all-MiniLM-L6-v2'
+    PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '1') == '1'  # Load the encoder at startup
+    MODEL_RETRY_SECONDS = float(os.environ.get('MODEL_RETRY_SECONDS', 60))  # Wait before retrying a failed encoder load
+    KEYWORD_STORE_DIR = os.environ.get('KEYWORD_STORE_DIR') or 'cache/embeddings'  # Built by build_keyword_store.py
+    EMBEDDING_CACHE_MAX_BYTES = int(os.environ.get('EMBEDDING_CACHE_MAX_BYTES', 64 * 1024 * 1024))  # 0 disables the cache
+    EVALUATION_BATCH_WINDOW_MS = float(os.environ.get('EVALUATION_BATCH_WINDOW_MS', 5))  # How long to wait for more texts
+    EVALUATION_BATCH_MAX_SIZE = int(os.environ.get('EVALUATION_BATCH_MAX_SIZE', 256))  # Texts per encode call
+    ENCODER_BACKEND = os.environ.get('ENCODER_BACKEND') or 'torch'  # torch, onnx or onnx-int8
+    ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR') or 'cache/onnx'  # Written by export_onnx.py
+    EVALUATION_WORKERS = int(os.environ.get('EVALUATION_WORKERS', 0))  # Worker processes, 0 evaluates in-process
+    EVALUATION_WORKER_QUEUE = int(os.environ.get('EVALUATION_WORKER_QUEUE', 4))  # Pending requests allowed per worker
+    EVALUATION_MODE = os.environ.get('EVALUATION_MODE') or 'embedding'  # embedding, lexical or tiered
+    # In tiered mode only answers whose lexical score falls inside this band are re-scored by the model
+    LEXICAL_UNCERTAIN_LOW = float(os.environ.get('LEXICAL_UNCERTAIN_LOW', 0.2))
+    LEXICAL_UNCERTAIN_HIGH = float(os.environ.get('LEXICAL_UNCERTAIN_HIGH', 0.8))
+    # Mean answer-to-keyword cosines mapped onto 0 and 1 before they are mixed with lexical scores
+    EMBEDDING_SCORE_FLOOR = float(os.environ.get('EMBEDDING_SCORE_FLOOR', 0.1))
+    EMBEDDING_SCORE_CEILING = float(os.environ.get('EMBEDDING_SCORE_CEILING', 0.6))
+
+    # Question bank
+    QUESTION_DATA_DIR = os.environ.get('QUESTION_DATA_DIR') or 'data'
+    QUESTION_SNAPSHOT_PATH = os.environ.get('QUESTION_SNAPSHOT_PATH') or 'cache/questions.snapshot'  # Built by build_question_snapshot.py
+    QUESTION_RELOAD_INTERVAL = float(os.environ.get('QUESTION_RELOAD_INTERVAL', 2.0))  # Seconds between data/ checks, 0 disables
+    QUESTION_CLUSTERS_PATH = os.environ.get('QUESTION_CLUSTERS_PATH') or 'cache/question_clusters.json'  # Built by build_question_clusters.py
+    QUESTION_DUPLICATE_THRESHOLD = float(os.environ.get('QUESTION_DUPLICATE_THRESHOLD', 0.85))  # Cosine similarity
+    PAPER_POOL_SIZE = int(os.environ.get('PAPER_POOL_SIZE', 64))  # Spare papers kept per domain and skill level
+    PAPER_POOL_REFRESH_INTERVAL = float(os.environ.get('PAPER_POOL_REFRESH_INTERVAL', 30.0))  # Seconds between top-ups, 0 disables pre-generation
+    PAPER_SEED_SECRET = os.environ.get('PAPER_SEED_SECRET') or SECRET_KEY  # Keys the per-test_id paper seeds
+    CATEGORY_PAGE_SIZE = int(os.environ.get('CATEGORY_PAGE_SIZE', 50))  # Questions per page of GET /questions/category/{category}
+
+    # Interview sessions
+    SESSION_DB_PATH = os.environ.get('SESSION_DB_PATH', 'cache/sessions.sqlite3')  # Empty keeps sessions in memory only
+    SESSION_TTL_SECONDS = float(os.environ.get('SESSION_TTL_SECONDS', 3600))  # Idle time before a session leaves memory
+    SESSION_SWEEP_INTERVAL = float(os.environ.get('SESSION_SWEEP_INTERVAL', 60))  # Seconds between idle-session sweeps, 0 disables
+
+    # Resume parsing
+    RESUME_PARSE_EXECUTOR = os.environ.get('RESUME_PARSE_EXECUTOR') or 'thread'  # thread or process
+    RESUME_PARSE_WORKERS = int(os.environ.get('RESUME_PARSE_WORKERS', 2))
+    RESUME_PARSE_QUEUE = int(os.environ.get('RESUME_PARSE_QUEUE', 8))  # Pending parses allowed per worker
+    RESUME_PARSE_TIMEOUT = float(os.environ.get('RESUME_PARSE_TIMEOUT', 30))  # Seconds before a request gives up on its parse
+    RESUME_BULK_WORKERS = int(os.environ.get('RESUME_BULK_WORKERS', os.cpu_count() or 1))  # Processes for bulk ingestion
+    MAX_BULK_BYTES = int(os.environ.get('MAX_BULK_BYTES', 200 * 1024 * 1024))  # Largest zip accepted by /resume/bulk
+    MAX_BULK_MEMBERS = int(os.environ.get('MAX_BULK_MEMBERS', 1000))  # Files per bulk archive
+    MAX_BULK_UNCOMPRESSED_BYTES = int(os.environ.get('MAX_BULK_UNCOMPRESSED_BYTES', 1024 * 1024 * 1024))  # Declared size of all files together
+    RESUME_CACHE_PATH = os.environ.get('RESUME_CACHE_PATH', 'cache/resumes.sqlite3')  # Parsed resumes by content hash, empty disables
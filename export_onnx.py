@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import inspect
+import os
+from config import Config
+from services.encoders import ONNX_INT8_MODEL_FILE, ONNX_MODEL_FILE, onnx_model_dir
+
+def export_onnx(model_name=Config.EMBEDDING_MODEL):
+    """Export the SentenceTransformer's transformer to ONNX (fp32) plus a dynamically quantized int8 copy"""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    output_dir = onnx_model_dir(model_name)
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Exporting {model_name} to {output_dir}...")
+    model = SentenceTransformer(model_name, device='cpu')
+    tokenizer = model.tokenizer
+    tokenizer.save_pretrained(output_dir)
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Only the token embeddings; pooling happens in OnnxEncoder"""
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids
+            ).last_hidden_state
+
+    sample = tokenizer(["warm up"], return_tensors='pt')
+    inputs = ['input_ids', 'attention_mask', 'token_type_ids']
+    fp32_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    options = {}
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        options['dynamo'] = False  # The TorchScript exporter needs no extra packages
+    torch.onnx.export(
+        TokenEmbeddings(model[0].auto_model).eval(),
+        tuple(sample[name] for name in inputs),
+        fp32_path,
+        input_names=inputs,
+        output_names=['token_embeddings'],
+        dynamic_axes={name: {0: 'batch', 1: 'sequence'} for name in inputs + ['token_embeddings']},
+        opset_version=14,
+        **options
+    )
+    print(f"Wrote {fp32_path}")
+
+    int8_path = os.path.join(output_dir, ONNX_INT8_MODEL_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    print(f"Wrote {int8_path}")
+
+if __name__ == "__main__":
+    export_onnx()
@@ -3,6 +3,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import resume_routes, question_routes, evaluation_routes, proctor_routes
 from fastapi.openapi.docs import get_swagger_ui_html
+from config import Config
+from services.category_pages import category_pages
+from services.evaluation_pool import evaluation_pool
+from services.model_registry import model_registry
+from services.paper_pool import paper_pool
+from services.question_bank import get_question_bank
+from services.question_bank_watcher import question_bank_watcher
+from services.question_search import question_search
+from services.resume_pool import bulk_resume_pool, resume_pool
+from services.session_store import session_store
+import threading
 
 app = FastAPI(
     title="AI Interview Chatbot API",
@@ -25,6 +36,34 @@ app.include_router(question_routes.router, prefix="/api")
 app.include_router(evaluation_routes.router, prefix="/api")
 app.include_router(proctor_routes.router, prefix="/api")
 
+@app.on_event("startup")
+async def preload_models():
+    """Build the question bank and papers, and load the evaluation model in the background"""
+    bank = get_question_bank()
+    category_pages.get(bank)
+    question_search.get(bank)
+    question_bank_watcher.start()
+    paper_pool.start()
+    session_store.start_sweeping()
+    # Parse workers start now rather than on the first upload, so the first bulk batch
+    # does not spend its parse timeout waiting for RESUME_BULK_WORKERS processes to boot
+    resume_pool.start()
+    bulk_resume_pool.start()
+    if evaluation_pool.enabled:
+        # Workers load their own models; the parent only shares the keyword matrix
+        evaluation_pool.start()
+    elif Config.PRELOAD_MODELS:
+        threading.Thread(target=model_registry.load, daemon=True).start()
+
+@app.on_event("shutdown")
+async def stop_workers():
+    question_bank_watcher.stop()
+    paper_pool.stop()
+    session_store.shutdown()
+    evaluation_pool.shutdown()
+    resume_pool.shutdown()
+    bulk_resume_pool.shutdown()
+
 @app.get("/")
 async def root():
     """Redirect root to docs"""
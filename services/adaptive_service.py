@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import math
+import random
+import threading
+from services.question_bank import INTERVIEW_SIZE
+from services.session_store import session_store
+
+# Item difficulty on the same logit scale as candidate ability
+DIFFICULTY_RATINGS = {
+    'beginner': -1.0,
+    'intermediate': 0.0,
+    'advanced': 0.75,
+    'expert': 1.5
+}
+# Starting ability from the skill level detected on the resume
+SKILL_LEVEL_PRIORS = {
+    'beginner': -0.5,
+    'intermediate': 0.25,
+    'expert': 1.0
+}
+
+class AdaptiveSession:
+    """Per-interview ability estimates and the questions already served"""
+
+    def __init__(self, domain, categories, prior, interview_size):
+        self.domain = domain
+        self.categories = categories
+        self.ability = {category: prior for category in categories}
+        self.asked = {category: 0 for category in categories}
+        # Same category mix as get_questions_for_interview
+        self.quota = -(-interview_size // len(categories))
+        self.interview_size = interview_size
+        self.served = set()
+        self.scored = set()  # question ids whose score already moved the ability
+        self.clusters = set()  # near-duplicate clusters of the served questions
+
+    @property
+    def complete(self):
+        return len(self.served) >= self.interview_size
+
+class AdaptiveSelector:
+    """Elo-style adaptive question selection.
+
+    After each answer the ability for that question's category moves by
+    k * (score - expected), where expected = 1 / (1 + exp(difficulty - ability)).
+    The next question comes from the least-served category, at the difficulty
+    level closest to the current ability, using the bank's prebuilt level buckets,
+    and never from the near-duplicate cluster of a question already served.
+    Sessions are shared between concurrent requests, so all state changes happen
+    under the selector's lock.
+    """
+
+    def __init__(self, k_factor=0.8, interview_size=INTERVIEW_SIZE):
+        self.k_factor = k_factor
+        self.interview_size = interview_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def start(self, test_id, bank, domain, skill_level):
+        categories = bank.categories(domain)
+        if not categories:
+            raise ValueError(f"No questions available for domain '{domain}'")
+        prior = SKILL_LEVEL_PRIORS.get(str(skill_level).lower(), 0.0)
+        session = AdaptiveSession(domain, categories, prior, self.interview_size)
+        with self._lock:
+            self._sessions[test_id] = session
+        return session
+
+    def get(self, test_id):
+        with self._lock:
+            return self._sessions.get(test_id)
+
+    def pop(self, test_id):
+        with self._lock:
+            return self._sessions.pop(test_id, None)
+
+    def record(self, session, question, score):
+        """Incremental ability update from one scored answer in [0, 1]; False if it was already scored"""
+        category = question['category']
+        with self._lock:
+            if category not in session.ability or question['id'] in session.scored:
+                return False
+            session.scored.add(question['id'])
+            score = min(max(float(score), 0.0), 1.0)
+            ability = session.ability[category]
+            expected = 1.0 / (1.0 + math.exp(DIFFICULTY_RATINGS[question['difficulty']] - ability))
+            session.ability[category] = ability + self.k_factor * (score - expected)
+            return True
+
+    def mark_served(self, session, bank, question):
+        """Count a question served outside next_question, e.g. when a session is restored"""
+        with self._lock:
+            self._serve(session, bank, question)
+
+    def next_question(self, session, bank):
+        """Pick an unserved question for the session, or None when the interview is complete"""
+        with self._lock:
+            if session.complete:
+                return None
+
+            # Least-served categories first, keeping the interview's category mix
+            for category in sorted(session.categories, key=lambda c: session.asked[c] / session.quota):
+                ability = session.ability[category]
+                for difficulty in sorted(DIFFICULTY_RATINGS, key=lambda d: abs(DIFFICULTY_RATINGS[d] - ability)):
+                    question = _unserved(bank, bank.at_level(session.domain, category, difficulty), session)
+                    if question is not None:
+                        self._serve(session, bank, question)
+                        return question
+            return None
+
+    def _serve(self, session, bank, question):
+        if question['id'] in session.served or question['category'] not in session.asked:
+            return
+        session.served.add(question['id'])
+        session.clusters.add(bank.cluster_of(question['id']))
+        session.asked[question['category']] += 1
+
+def _unserved(bank, bucket, session):
+    """A random question from bucket neither served nor a near-duplicate of one served"""
+    if not bucket:
+        return None
+    start = random.randrange(len(bucket))
+    for offset in range(len(bucket)):
+        question = bucket[(start + offset) % len(bucket)]
+        if question['id'] not in session.served and bank.cluster_of(question['id']) not in session.clusters:
+            return question
+    return None
+
+adaptive_selector = AdaptiveSelector()
+# Adaptive state leaves memory with its session; it is replayed from the store on demand
+session_store.add_eviction_listener(adaptive_selector.pop)
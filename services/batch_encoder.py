@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import queue
+import threading
+import time
+import numpy as np
+from config import Config
+
+class BatchEncoder:
+    """Coalesces encode requests from concurrent callers into batched calls on a worker thread"""
+
+    def __init__(self, encode_fn, window_ms=Config.EVALUATION_BATCH_WINDOW_MS,
+                 max_batch_size=Config.EVALUATION_BATCH_MAX_SIZE):
+        self.encode_fn = encode_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.texts_encoded = 0
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='batch-encoder', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+    async def encode(self, texts):
+        """Queue texts for the next batch and wait for their embeddings"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((list(texts), loop, future))
+        return await future
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            batch = [job]
+            size = len(job[0])
+            deadline = time.monotonic() + self.window
+            stopping = False
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+                size += len(job[0])
+
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch):
+        # Texts shared between callers are only encoded once
+        texts = {}
+        rows = [[texts.setdefault(text, len(texts)) for text in job_texts] for job_texts, _, _ in batch]
+
+        try:
+            embeddings = np.asarray(self.encode_fn(list(texts)))
+        except Exception as e:
+            for _, loop, future in batch:
+                loop.call_soon_threadsafe(_set_exception, future, e)
+            return
+
+        self.batches += 1
+        self.texts_encoded += len(texts)
+        for job_rows, (_, loop, future) in zip(rows, batch):
+            loop.call_soon_threadsafe(_set_result, future, embeddings[job_rows])
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'texts_encoded': self.texts_encoded,
+            'queued': self._queue.qsize(),
+            'window_ms': self.window * 1000.0,
+            'max_batch_size': self.max_batch_size
+        }
+
+def _set_result(future, result):
+    if not future.done():  # The caller may have been cancelled meanwhile
+        future.set_result(result)
+
+def _set_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
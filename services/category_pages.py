@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import json
+import threading
+from config import Config
+
+# Fields exposed by the API Question model
+QUESTION_FIELDS = ('id', 'category', 'difficulty', 'question', 'expected_keywords')
+
+class CategoryPage:
+    """One page of a category listing, serialized and gzip-compressed up front"""
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # mtime=0 keeps the compressed bytes, and so their ETag, stable across rebuilds
+        self.gzip_body = gzip.compress(self.body, compresslevel=9, mtime=0)
+        digest = hashlib.sha256(self.body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        # A strong ETag identifies exact bytes, so the compressed variant needs its own
+        self.gzip_etag = f'"{digest}-gzip"'
+
+class CategoryPages:
+    """Every category listing of one question bank, split into fixed-size pages"""
+
+    def __init__(self, bank, page_size=Config.CATEGORY_PAGE_SIZE):
+        self.version = bank.version
+        self.page_size = max(1, page_size)
+        self.pages = {}
+        # Same keys in_category accepts: legacy file-name keys and question categories
+        for category in set(bank.by_category) | set(bank.by_source):
+            questions = [{field: q[field] for field in QUESTION_FIELDS} for q in bank.in_category(category)]
+            page_count = max(1, -(-len(questions) // self.page_size))
+            self.pages[category] = tuple(
+                CategoryPage({
+                    'category': category,
+                    'page': page,
+                    'pages': page_count,
+                    'page_size': self.page_size,
+                    'total': len(questions),
+                    'questions': questions[(page - 1) * self.page_size:page * self.page_size]
+                })
+                for page in range(1, page_count + 1)
+            )
+
+    def page(self, category, page=1):
+        """The CategoryPage, or None for an unknown category or a page past the end"""
+        pages = self.pages.get(str(category).strip().lower())
+        if pages is None or not 1 <= page <= len(pages):
+            return None
+        return pages[page - 1]
+
+class CategoryPageCache:
+    """Serialized category pages for the current bank, rebuilt once per bank version"""
+
+    def __init__(self, page_size=Config.CATEGORY_PAGE_SIZE):
+        self.page_size = page_size
+        self._pages = None
+        self._lock = threading.Lock()
+
+    def get(self, bank):
+        pages = self._pages
+        if pages is None or pages.version != bank.version:
+            with self._lock:
+                pages = self._pages
+                if pages is None or pages.version != bank.version:
+                    pages = self._pages = CategoryPages(bank, self.page_size)
+        return pages
+
+category_pages = CategoryPageCache()
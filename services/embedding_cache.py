@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from config import Config
+
+class EmbeddingCache:
+    """Thread-safe, memory-bounded LRU cache of text embeddings keyed by content hash"""
+
+    def __init__(self, max_bytes=Config.EMBEDDING_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # digest -> vector, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_used = 0
+
+    @staticmethod
+    def key(text, namespace=''):
+        return hashlib.sha256(f"{namespace}\0{text}".encode('utf-8')).digest()
+
+    def encode(self, texts, encode_fn, namespace=''):
+        """Return embeddings for texts, calling encode_fn once for all cache misses"""
+        keys = [self.key(text, namespace) for text in texts]
+        vectors = [None] * len(texts)
+        missing = []
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    vectors[i] = vector
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # Encode outside the lock so concurrent requests are not serialised on it
+            encoded = np.asarray(encode_fn([texts[i] for i in missing]), dtype=np.float32)
+            with self._lock:
+                for i, vector in zip(missing, encoded):
+                    # Copy so the entry does not keep the whole batch array alive
+                    vectors[i] = vector.copy()
+                    self._put(keys[i], vectors[i])
+
+        return np.stack(vectors)
+
+    def _put(self, key, vector):
+        if vector.nbytes > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes_used -= previous.nbytes
+        self._entries[key] = vector
+        self.bytes_used += vector.nbytes
+        while self.bytes_used > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes_used -= evicted.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'bytes_used': self.bytes_used,
+                'max_bytes': self.max_bytes
+            }
+
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import os
+from pathlib import Path
+import numpy as np
+from config import Config
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+ONNX_MODEL_FILE = 'model.onnx'
+ONNX_INT8_MODEL_FILE = 'model_int8.onnx'
+
+class Encoder:
+    """Interface shared by the sentence encoder backends"""
+    backend = None
+
+    def encode(self, texts, batch_size=32):
+        """Return a (len(texts), dim) float32 array of sentence embeddings"""
+        raise NotImplementedError
+
+    def get_sentence_embedding_dimension(self):
+        raise NotImplementedError
+
+class TorchEncoder(Encoder):
+    """The SentenceTransformer model running on PyTorch"""
+    backend = 'torch'
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+
+    def encode(self, texts, batch_size=32):
+        return self.model.encode(list(texts), batch_size=batch_size, convert_to_numpy=True)
+
+    def get_sentence_embedding_dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+class OnnxEncoder(Encoder):
+    """An exported transformer running on ONNX Runtime's CPU provider, with mean pooling"""
+
+    def __init__(self, model_dir, quantized=False, max_length=256):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_path = Path(model_dir) / (ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        if not model_path.exists():
+            raise FileNotFoundError(f"{model_path} not found, run export_onnx.py first")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_path), options, providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.max_length = max_length
+        self.backend = 'onnx-int8' if quantized else 'onnx'
+        self._dimension = None
+
+    def encode(self, texts, batch_size=32):
+        texts = list(texts)
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors='np'
+            )
+            feeds = {name: tokens[name].astype(np.int64) for name in self.input_names if name in tokens}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real tokens, as SentenceTransformer does
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = np.vstack(batches)
+        self._dimension = embeddings.shape[1]
+        return embeddings
+
+    def get_sentence_embedding_dimension(self):
+        if self._dimension is None:
+            self.encode(["warm up"])
+        return self._dimension
+
+def onnx_model_dir(model_name):
+    return os.path.join(Config.ONNX_MODEL_DIR, model_name.replace('/', '_'))
+
+def create_encoder(backend, model_name):
+    """Build the encoder for a configured backend"""
+    if backend == 'torch':
+        return TorchEncoder(model_name)
+    if backend in ('onnx', 'onnx-int8'):
+        return OnnxEncoder(onnx_model_dir(model_name), quantized=backend == 'onnx-int8')
+    raise ValueError(f"Unknown encoder backend '{backend}', expected one of {', '.join(BACKENDS)}")
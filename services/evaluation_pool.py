@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from config import Config
+from services import evaluation_worker
+from services.keyword_store import KeywordStore
+from services.model_registry import model_registry
+from services.worker_processes import spawn_pool
+
+class EvaluationPoolBusy(Exception):
+    """Raised when every worker's queue is full"""
+
+class EvaluationPool:
+    """Evaluation worker processes that share one keyword embedding matrix through shared memory.
+
+    Each worker still loads its own encoder; the keyword matrix, which grows with the
+    question bank, is held once by the parent and mapped read-only by every worker.
+    """
+
+    def __init__(self, workers=Config.EVALUATION_WORKERS, queue_size=Config.EVALUATION_WORKER_QUEUE):
+        self.workers = workers
+        self.max_pending = workers * queue_size
+        self.pending = 0
+        self.rejected = 0
+        self._executor = None
+        self._shared_matrix = None
+        self._ready = None  # Workers whose encoder loaded, counted by the workers themselves
+        self._failed = None
+
+    @property
+    def enabled(self):
+        return self.workers > 0
+
+    def start(self):
+        if self._executor is not None:
+            return
+
+        shared = None
+        store = KeywordStore.load(model_name=model_registry.model_id)
+        if store is not None:
+            self._shared_matrix = shared_memory.SharedMemory(create=True, size=max(store.matrix.nbytes, 1))
+            matrix = np.ndarray(store.matrix.shape, dtype=np.float32, buffer=self._shared_matrix.buf)
+            matrix[:] = store.matrix
+            shared = (self._shared_matrix.name, store.matrix.shape)
+        else:
+            print("Warning: No keyword store found, evaluation workers will encode keywords themselves")
+
+        # Spawn rather than fork so workers never inherit a half-initialised model
+        context = multiprocessing.get_context('spawn')
+        self._ready = context.Value('i', 0)
+        self._failed = context.Value('i', 0)
+        # Every worker starts now and loads its encoder in the initializer
+        self._executor = spawn_pool(self.workers, evaluation_worker, (shared, self._ready, self._failed), context)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._shared_matrix is not None:
+            self._shared_matrix.close()
+            self._shared_matrix.unlink()
+            self._shared_matrix = None
+
+    async def evaluate_answers(self, answers):
+        return await self._submit(evaluation_worker.evaluate_answers, answers)
+
+    async def score_answers(self, answers):
+        return await self._submit(evaluation_worker.score_answers, answers)
+
+    async def _submit(self, fn, answers):
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise EvaluationPoolBusy("All evaluation workers are busy")
+
+        self.start()
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, answers)
+        finally:
+            self.pending -= 1
+
+    def is_ready(self):
+        """True once every worker has loaded its encoder"""
+        return self._ready is not None and self._ready.value >= self.workers
+
+    def status(self):
+        return {
+            'workers': self.workers,
+            'ready': self.is_ready(),
+            'ready_workers': self._ready.value if self._ready is not None else 0,
+            'failed_workers': self._failed.value if self._failed is not None else 0,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'rejected': self.rejected,
+            'shared_matrix_bytes': self._shared_matrix.size if self._shared_matrix else 0
+        }
+
+evaluation_pool = EvaluationPool()
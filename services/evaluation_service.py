@@ -1,54 +1,111 @@
 # -*- coding: utf-8 -*-
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import threading
 import numpy as np
+from config import Config
+from services.embedding_cache import embedding_cache
+from services.keyword_store import KeywordStore
+from services.lexical_scorer import LexicalScorer
+from services.model_registry import model_registry
+from services.question_bank import get_question_bank
+from services.session_scoring import STRENGTH_THRESHOLD, WEAKNESS_THRESHOLD
 
 class EvaluationService:
-    def __init__(self):
-        try:
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        except Exception as e:
-            print(f"Warning: Could not load SentenceTransformer model: {str(e)}")
-            self.model = None
+    def __init__(self, registry=None, keyword_store=None, cache=None, mode=Config.EVALUATION_MODE):
+        # All instances share the process-wide model and embedding cache
+        self.registry = registry or model_registry
+        self.cache = cache or embedding_cache
+        self.mode = mode
+        self.lexical_scorer = LexicalScorer()
+        # Question bank keywords are precomputed, so only answers need encoding
+        if keyword_store is None:
+            keyword_store = KeywordStore.load(model_name=self.registry.model_id)
+        self.keyword_store = keyword_store
+
+    @property
+    def model(self):
+        return self.registry.get_model()
     
     def evaluate_answers(self, answers):
         """Evaluate interview answers"""
         if not answers:
             return self._empty_evaluation()
             
-        if not self.model:
-            return self._fallback_evaluation(answers)
-            
         try:
-            total_score = 0
-            strengths = []
-            weaknesses = []
-            
-            for answer in answers:
-                score = self._evaluate_single_answer(
-                    answer['question'],
-                    answer['answer'],
-                    answer.get('expected_keywords', [])
-                )
-                total_score += score
-                
-                if score >= 0.7:
-                    strengths.append(f"Strong understanding of {answer['question']}")
-                elif score <= 0.4:
-                    weaknesses.append(f"Need improvement in {answer['question']}")
-            
-            avg_score = total_score / len(answers)
-            
-            return {
-                'score': float(avg_score),
-                'feedback': self._generate_feedback(avg_score),
-                'strengths': strengths,
-                'weaknesses': weaknesses,
-                'recommendations': self._generate_recommendations(weaknesses)
-            }
+            return self._build_evaluation(answers, self._score_answers(answers))
         except Exception as e:
             print(f"Error in evaluate_answers: {str(e)}")
             return self._fallback_evaluation(answers)
+
+    async def evaluate_answers_async(self, answers, batch_encoder):
+        """Evaluate interview answers, encoding through the shared batch encoder"""
+        if not answers:
+            return self._empty_evaluation()
+
+        try:
+            scores = await self.score_answers_async(answers, batch_encoder)
+            return self._build_evaluation(answers, scores)
+        except Exception as e:
+            print(f"Error in evaluate_answers_async: {str(e)}")
+            return self._fallback_evaluation(answers)
+
+    async def score_answers_async(self, answers, batch_encoder):
+        """Per-answer scores; lexical while the model is loading or unavailable"""
+        scores, pending = self._lexical_tier(answers)
+        if not pending:
+            return scores
+
+        # Never load the model on the event loop: serve lexical scores until it is ready
+        if not self.registry.is_ready():
+            if self.registry.state != 'loading' and self.registry.can_load():
+                threading.Thread(target=self.registry.load, daemon=True).start()
+            return self.lexical_scores(answers)
+
+        plan = self._plan_scoring([answers[i] for i in pending])
+        embeddings = await batch_encoder.encode(plan[0]) if plan[0] else None
+        return self._merge_tiers(scores, pending, self._scores_from_plan(plan, embeddings))
+
+    def evaluate_answers_lexical(self, answers):
+        """Evaluate with the lexical scorer only, without touching the model"""
+        if not answers:
+            return self._empty_evaluation()
+        return self._build_evaluation(answers, self.lexical_scores(answers))
+
+    def session_evaluation(self, session):
+        """Final evaluation from a running SessionScore, without re-scoring any answer"""
+        if not session.answered:
+            return self._empty_evaluation()
+
+        avg_score = session.average
+        weaknesses = list(session.weaknesses.values())
+        return {
+            'score': avg_score,
+            'feedback': self._generate_feedback(avg_score),
+            'strengths': list(session.strengths.values()),
+            'weaknesses': weaknesses,
+            'recommendations': self._generate_recommendations(weaknesses),
+            'category_scores': session.category_scores(),
+            'answered': session.answered
+        }
+
+    def _build_evaluation(self, answers, scores):
+        strengths = []
+        weaknesses = []
+        
+        for answer, score in zip(answers, scores):
+            if score >= STRENGTH_THRESHOLD:
+                strengths.append(f"Strong understanding of {answer['question']}")
+            elif score <= WEAKNESS_THRESHOLD:
+                weaknesses.append(f"Need improvement in {answer['question']}")
+        
+        avg_score = float(np.mean(scores))
+        
+        return {
+            'score': avg_score,
+            'feedback': self._generate_feedback(avg_score),
+            'strengths': strengths,
+            'weaknesses': weaknesses,
+            'recommendations': self._generate_recommendations(weaknesses)
+        }
     
     def _empty_evaluation(self):
         return {
@@ -60,6 +117,10 @@ class EvaluationService:
         }
     
     def _fallback_evaluation(self, answers):
+        try:
+            return self.evaluate_answers_lexical(answers)
+        except Exception as e:
+            print(f"Error in lexical evaluation: {str(e)}")
         return {
             'score': 0.5,
             'feedback': "Basic evaluation performed due to technical limitations.",
@@ -68,18 +129,162 @@ class EvaluationService:
             'recommendations': ["Please try again later for detailed evaluation."]
         }
     
-    def _evaluate_single_answer(self, question, answer, expected_keywords):
-        """Evaluate a single answer using semantic similarity"""
-        if not answer:
-            return 0.0
-        
-        # Encode the answer and expected keywords
-        answer_embedding = self.model.encode([answer])[0]
-        keyword_embeddings = self.model.encode(expected_keywords)
-        
-        # Calculate similarity with keywords
-        similarities = cosine_similarity([answer_embedding], keyword_embeddings)[0]
-        return float(np.mean(similarities))
+    def _score_answers(self, answers):
+        """Score answers according to the evaluation mode"""
+        scores, pending = self._lexical_tier(answers)
+        if not pending:
+            return scores
+        if not self.model:
+            return self.lexical_scores(answers)
+        return self._merge_tiers(scores, pending, self._embedding_scores([answers[i] for i in pending]))
+
+    def lexical_scores(self, answers):
+        """Lexical scores in [0, 1]; answers sent with only a question_id use that question's keywords"""
+        return self.lexical_scorer.score_answers([
+            self._with_question_keywords(answer) for answer in answers
+        ])
+
+    def _with_question_keywords(self, answer):
+        """The answer with expected_keywords resolved the way _keyword_refs resolves them"""
+        if answer.get('expected_keywords') is not None or not answer.get('question_id'):
+            return answer
+        keywords = self._question_keywords(answer['question_id'])
+        return answer if keywords is None else {**answer, 'expected_keywords': keywords}
+
+    def _question_index(self):
+        """The keyword store, if its per-question index was built from the current question bank"""
+        store = self.keyword_store
+        if store is None or store.fingerprint != get_question_bank().fingerprint:
+            # Built before a reload: question ids may now have other keywords
+            return None
+        return store
+
+    def _question_keywords(self, question_id):
+        store = self._question_index()
+        if store is not None:
+            return store.keywords_for_question(question_id)
+        question = get_question_bank().get(question_id)
+        return None if question is None else list(question['expected_keywords'])
+
+    def _lexical_tier(self, answers):
+        """Lexical scores plus the indices of answers that still need the embedding model"""
+        if self.mode == 'embedding':
+            return np.zeros(len(answers)), list(range(len(answers)))
+
+        scores = self.lexical_scores(answers)
+        if self.mode == 'lexical':
+            return scores, []
+        uncertain = (scores >= Config.LEXICAL_UNCERTAIN_LOW) & (scores <= Config.LEXICAL_UNCERTAIN_HIGH)
+        return scores, np.flatnonzero(uncertain).tolist()
+
+    def _merge_tiers(self, scores, pending, embedding_scores):
+        """Fold embedding scores for the pending answers into the lexical scores.
+
+        Embedding mode keeps the mean keyword cosine as before. In tiered mode the cosine,
+        which sits on a much narrower scale than the saturated lexical score, is first
+        stretched onto [0, 1] between EMBEDDING_SCORE_FLOOR and EMBEDDING_SCORE_CEILING,
+        then averaged with the lexical score and kept inside the uncertain band. A
+        re-scored answer never overtakes one the lexical tier was confident about, nor
+        drops below one it had already rejected.
+        """
+        if self.mode == 'embedding':
+            scores[pending] = embedding_scores
+            return scores
+        floor, ceiling = Config.EMBEDDING_SCORE_FLOOR, Config.EMBEDDING_SCORE_CEILING
+        calibrated = np.clip((np.asarray(embedding_scores) - floor) / max(ceiling - floor, 1e-6), 0.0, 1.0)
+        blended = (scores[pending] + calibrated) / 2
+        scores[pending] = np.clip(blended, Config.LEXICAL_UNCERTAIN_LOW, Config.LEXICAL_UNCERTAIN_HIGH)
+        return scores
+
+    def _embedding_scores(self, answers):
+        """Score every answer against its keywords with a single batched encode"""
+        plan = self._plan_scoring(answers)
+        embeddings = self.encode_texts(plan[0]) if plan[0] else None
+        return self._scores_from_plan(plan, embeddings)
+
+    def _plan_scoring(self, answers):
+        """Collect the unique texts to encode and how each answer maps onto them"""
+        # Intern every distinct string so repeated answers/keywords are encoded once
+        texts = {}
+        stored_rows = {}
+        answer_rows = []
+        keyword_refs = []
+        for answer in answers:
+            text = answer.get('answer')
+            answer_rows.append(texts.setdefault(text, len(texts)) if text else -1)
+            keyword_refs.append(self._keyword_refs(answer, texts, stored_rows))
+
+        if all(row < 0 for row in answer_rows):
+            texts = {}  # Nothing to score, skip encoding entirely
+        return list(texts), answer_rows, keyword_refs, list(stored_rows)
+
+    def _scores_from_plan(self, plan, embeddings):
+        texts, answer_rows, keyword_refs, stored_rows = plan
+        if embeddings is None:
+            return np.zeros(len(answer_rows))
+
+        # Keyword columns: freshly encoded texts first, then rows taken from the store
+        keyword_matrix = embeddings
+        if stored_rows:
+            keyword_matrix = np.vstack([embeddings, self.keyword_store.matrix[stored_rows]])
+        keyword_rows = [
+            [ref if is_encoded else len(texts) + ref for is_encoded, ref in refs]
+            for refs in keyword_refs
+        ]
+        return self._cosine_scores(embeddings, answer_rows, keyword_matrix, keyword_rows)
+
+    def _keyword_refs(self, answer, texts, stored_rows):
+        """Resolve an answer's keywords to (is_encoded, index) pairs"""
+        store = self.keyword_store
+        keywords = answer.get('expected_keywords')
+        if keywords is None and answer.get('question_id'):
+            index = self._question_index()
+            rows = index.rows_for_question(answer['question_id']) if index is not None else None
+            if rows is not None:
+                return [(False, stored_rows.setdefault(row, len(stored_rows))) for row in rows]
+            # Keywords of the current bank; those the store already holds still come from it
+            keywords = self._question_keywords(answer['question_id'])
+
+        refs = []
+        for keyword in keywords or []:
+            keyword = str(keyword)
+            row = store.row_for(keyword) if store is not None else None
+            if row is None:
+                refs.append((True, texts.setdefault(keyword, len(texts))))
+            else:
+                refs.append((False, stored_rows.setdefault(row, len(stored_rows))))
+        return refs
+
+    def encode_texts(self, texts):
+        """Normalised embeddings for texts, served from the cache where possible"""
+        if self.cache.max_bytes <= 0:
+            return self._normalize(self.model.encode(texts))
+        model = self.model
+        return self.cache.encode(
+            texts,
+            lambda missing: self._normalize(model.encode(missing)),
+            namespace=self.registry.model_id
+        )
+
+    def _normalize(self, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+    def _cosine_scores(self, answer_matrix, answer_rows, keyword_matrix, keyword_rows):
+        """Mean cosine similarity between each answer row and its keyword rows (inputs normalised)"""
+        answer_rows = np.asarray(answer_rows, dtype=np.int64)
+        has_answer = answer_rows >= 0
+
+        # weights[i, j] = how often keyword column j appears in answer i's keyword list
+        weights = np.zeros((len(answer_rows), len(keyword_matrix)), dtype=np.float32)
+        for i, rows in enumerate(keyword_rows):
+            np.add.at(weights[i], np.asarray(rows, dtype=np.int64), 1.0)
+        counts = weights.sum(axis=1)
+
+        similarities = answer_matrix[np.where(has_answer, answer_rows, 0)] @ keyword_matrix.T
+        totals = (similarities * weights).sum(axis=1)
+        scores = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+        return np.where(has_answer, scores, 0.0)
     
     def _generate_feedback(self, score):
         if score >= 0.8:
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Code run inside evaluation worker processes.
+
+Workers are spawned with this module standing in for __main__, so they import only
+what scoring needs and never the app, its routes or the proctoring models.
+"""
+from multiprocessing import shared_memory
+import numpy as np
+from services.evaluation_service import EvaluationService
+from services.keyword_store import KeywordStore
+from services.model_registry import model_registry
+
+_service = None
+_shared_matrix = None
+_counters = None  # (ready, failed) shared with the parent
+_loaded = False
+
+def init_worker(shared, ready, failed):
+    """Build the worker's EvaluationService and load its encoder, then report to the parent"""
+    global _service, _shared_matrix, _counters
+    _counters = (ready, failed)
+    store = None
+    if shared is not None:
+        name, shape = shared
+        _shared_matrix = shared_memory.SharedMemory(name=name)
+        # Index from disk, vectors from the parent's shared block instead of a private copy
+        store = KeywordStore.load(model_name=model_registry.model_id)
+        if store is not None:
+            store.matrix = np.ndarray(shape, dtype=np.float32, buffer=_shared_matrix.buf)
+    _service = EvaluationService(keyword_store=store)
+
+    # A failed load is reported rather than raised: raising here would break the whole pool.
+    # Each worker counts as failed until its encoder loads, here or on a later retry
+    model_registry.load()
+    _report(failed, 1)
+    _report_ready()
+
+def _report_ready():
+    """Move this worker from failed to ready once its encoder has loaded, e.g. on a retry"""
+    global _loaded
+    if _loaded or not model_registry.is_ready():
+        return
+    _loaded = True
+    ready, failed = _counters
+    _report(failed, -1)
+    _report(ready, 1)
+
+def _report(counter, delta):
+    with counter.get_lock():
+        counter.value += delta
+
+def started():
+    """No-op job; submitting one per worker makes the executor start every process"""
+    return None
+
+def evaluate_answers(answers):
+    try:
+        return _service.evaluate_answers(answers)
+    finally:
+        _report_ready()
+
+def score_answers(answers):
+    try:
+        return [float(score) for score in _service._score_answers(answers)]
+    finally:
+        _report_ready()
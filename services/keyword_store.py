@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from pathlib import Path
+import numpy as np
+from config import Config
+
+MATRIX_FILE = 'keywords.npy'
+INDEX_FILE = 'keyword_index.json'
+
+class KeywordStore:
+    """Precomputed, L2-normalised embeddings of every expected keyword in the question bank"""
+
+    def __init__(self, matrix, vocabulary, question_rows, model_name=None, fingerprint=None):
+        self.matrix = matrix  # (n_keywords, dim), memory-mapped when loaded from disk
+        self.vocabulary = vocabulary  # keyword -> row
+        self.keywords = sorted(vocabulary, key=vocabulary.get)  # row -> keyword
+        self.question_rows = question_rows  # question id -> [row, ...]
+        self.model_name = model_name
+        self.fingerprint = fingerprint  # question_fingerprint of the bank question_rows was built from
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def row_for(self, keyword):
+        """Row of a keyword in the matrix, or None if it was not in the bank"""
+        return self.vocabulary.get(keyword)
+
+    def rows_for_question(self, question_id):
+        return self.question_rows.get(question_id)
+
+    def keywords_for_question(self, question_id):
+        """A question's expected keywords as stored at build time, or None if it was not in the bank"""
+        rows = self.question_rows.get(question_id)
+        return None if rows is None else [self.keywords[row] for row in rows]
+
+    @classmethod
+    def load(cls, store_dir=Config.KEYWORD_STORE_DIR, model_name=None):
+        """Memory-map a built store; returns None if it is missing or was built with another model"""
+        matrix_path = Path(store_dir) / MATRIX_FILE
+        index_path = Path(store_dir) / INDEX_FILE
+        if not matrix_path.exists() or not index_path.exists():
+            return None
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if model_name and index.get('model') != model_name:
+                print(f"Warning: Keyword store was built with {index.get('model')}, expected {model_name}")
+                return None
+
+            matrix = np.load(matrix_path, mmap_mode='r')
+            vocabulary = {keyword: row for row, keyword in enumerate(index['keywords'])}
+            if matrix.shape[0] != len(vocabulary):
+                print(f"Warning: Keyword store at {store_dir} is inconsistent, ignoring it")
+                return None
+            return cls(matrix, vocabulary, index['questions'], index.get('model'), index.get('fingerprint'))
+        except Exception as e:
+            print(f"Error loading keyword store from {store_dir}: {str(e)}")
+            return None
+
+    @staticmethod
+    def build(model, model_name, questions, store_dir=Config.KEYWORD_STORE_DIR, fingerprint=None):
+        """Encode each unique keyword of the question bank once and write the store to disk"""
+        keywords = {}
+        question_rows = {}
+        for question in questions:
+            rows = [keywords.setdefault(k, len(keywords)) for k in question['expected_keywords']]
+            if question['id'] in question_rows and question_rows[question['id']] != rows:
+                print(f"Warning: Duplicate question id {question['id']}, keeping the first one")
+                continue
+            question_rows[question['id']] = rows
+
+        vocabulary = list(keywords)
+        embeddings = np.asarray(model.encode(vocabulary, batch_size=256), dtype=np.float32)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+        os.makedirs(store_dir, exist_ok=True)
+        np.save(Path(store_dir) / MATRIX_FILE, embeddings)
+        with open(Path(store_dir) / INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'model': model_name,
+                'fingerprint': fingerprint,
+                'keywords': vocabulary,
+                'questions': question_rows
+            }, f)
+
+        return len(vocabulary), len(question_rows)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+import re
+from functools import lru_cache
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Longest suffixes first; a light stand-in for Porter stemming
+SUFFIXES = (
+    ('ational', 'ate'), ('ization', 'ize'), ('fulness', 'ful'), ('ousness', 'ous'),
+    ('iveness', 'ive'), ('ements', ''), ('ations', 'ate'), ('ation', 'ate'), ('ement', ''),
+    ('ments', ''), ('ment', ''), ('ness', ''), ('ities', 'ity'), ('ingly', ''), ('edly', ''),
+    ('ies', 'y'), ('ing', ''), ('sses', 'ss'), ('ly', ''), ('ed', ''), ('es', ''), ('s', '')
+)
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    if word.endswith('ss'):
+        return word
+    return word.rstrip('e') if len(word) > 4 else word
+
+def tokenize(text):
+    return [stem(token) for token in TOKEN_PATTERN.findall(str(text).lower())]
+
+class LexicalScorer:
+    """Model-free answer scoring: BM25-saturated coverage of stemmed expected keywords.
+
+    Each keyword scores the mean, over its stemmed terms, of
+    min(1, tf * (k1 + 1) / (tf + k1 * (1 - b + b * len / avg_len))), so a keyword
+    mentioned once in an answer of average length counts fully, repetition saturates
+    and very long answers are discounted. An answer scores the mean over its keywords.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, avg_length=60):
+        self.k1 = k1
+        self.b = b
+        self.avg_length = avg_length
+
+    def score_answers(self, answers):
+        """Scores in [0, 1] for a list of answer dicts, computed as matrix operations"""
+        vocabulary = {}
+        answer_terms = []
+        keyword_owner = []
+        keyword_terms = []
+        for i, answer in enumerate(answers):
+            answer_terms.append([vocabulary.setdefault(t, len(vocabulary)) for t in tokenize(answer.get('answer') or '')])
+            for keyword in answer.get('expected_keywords') or []:
+                terms = [vocabulary.setdefault(t, len(vocabulary)) for t in tokenize(keyword)]
+                if terms:
+                    keyword_owner.append(i)
+                    keyword_terms.append(terms)
+
+        scores = np.zeros(len(answers))
+        if not keyword_terms:
+            return scores
+
+        # Term frequencies, one row per answer
+        tf = np.zeros((len(answers), len(vocabulary)), dtype=np.float32)
+        lengths = np.zeros(len(answers), dtype=np.float32)
+        for i, terms in enumerate(answer_terms):
+            np.add.at(tf[i], np.asarray(terms, dtype=np.int64), 1.0)
+            lengths[i] = len(terms)
+        norm = self.k1 * (1 - self.b + self.b * lengths / self.avg_length)
+        saturated = np.minimum(tf * (self.k1 + 1) / (tf + norm[:, None]), 1.0)
+
+        # Keyword-by-term incidence, each row averaging over that keyword's terms
+        incidence = np.zeros((len(keyword_terms), len(vocabulary)), dtype=np.float32)
+        for k, terms in enumerate(keyword_terms):
+            incidence[k, list(set(terms))] = 1.0
+        incidence /= incidence.sum(axis=1, keepdims=True)
+
+        keyword_owner = np.asarray(keyword_owner)
+        keyword_scores = (incidence * saturated[keyword_owner]).sum(axis=1)
+        totals = np.bincount(keyword_owner, weights=keyword_scores, minlength=len(answers))
+        counts = np.bincount(keyword_owner, minlength=len(answers))
+        np.divide(totals, counts, out=scores, where=counts > 0)
+        return scores
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from config import Config
+from services.encoders import create_encoder
+
+class ModelRegistry:
+    """Process-wide registry that loads the sentence encoder once and shares it"""
+
+    def __init__(self, model_name=Config.EMBEDDING_MODEL, backend=Config.ENCODER_BACKEND,
+                 retry_seconds=Config.MODEL_RETRY_SECONDS):
+        self.model_name = model_name
+        self.backend = backend
+        self.retry_seconds = retry_seconds
+        self.state = 'not_loaded'  # not_loaded -> loading -> ready | failed, failed -> loading after retry_seconds
+        self.error = None  # Last load error, kept after a later load succeeds
+        self.failures = 0
+        self.load_seconds = None
+        self._failed_at = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model_id(self):
+        """Identifies the embedding space; vectors from different backends are not mixed"""
+        return f"{self.model_name}@{self.backend}"
+
+    def get_model(self):
+        """Return the shared model, loading it on first use or retrying a failed load"""
+        if self._model is None and self.can_load():
+            return self.load()
+        return self._model
+
+    def can_load(self):
+        """False while a failed load is backing off, so a broken model is not retried per request"""
+        return self.state != 'failed' or self.retry_in() == 0
+
+    def retry_in(self):
+        """Seconds until a failed load may be retried"""
+        if self.state != 'failed':
+            return None
+        return max(0.0, self.retry_seconds - (time.monotonic() - self._failed_at))
+
+    def load(self):
+        """Load and warm up the model; concurrent callers wait on the same load"""
+        with self._lock:
+            if self._model is not None or not self.can_load():
+                return self._model
+
+            self.state = 'loading'
+            started = time.perf_counter()
+            try:
+                model = create_encoder(self.backend, self.model_name)
+                # Warm up so the first real request does not pay for lazy init
+                model.encode(["warm up"])
+            except Exception as e:
+                print(f"Warning: Could not load {self.backend} encoder for {self.model_name}: {str(e)}")
+                self.state = 'failed'
+                self.error = str(e)
+                self.failures += 1
+                self._failed_at = time.monotonic()
+                return None
+
+            self._model = model
+            self.load_seconds = time.perf_counter() - started
+            self.state = 'ready'
+            return self._model
+
+    def is_ready(self):
+        return self.state == 'ready'
+
+    def status(self):
+        return {
+            'model': self.model_name,
+            'backend': self.backend,
+            'state': self.state,
+            'ready': self.is_ready(),
+            'load_seconds': self.load_seconds,
+            'error': self.error,
+            'failures': self.failures,
+            'retry_in_seconds': self.retry_in()
+        }
+
+model_registry = ModelRegistry()
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import hmac
+import random
+import threading
+import time
+from collections import deque
+from config import Config
+from services.adaptive_service import SKILL_LEVEL_PRIORS
+from services.question_service import QuestionService
+from services.session_store import session_store
+
+DEFAULT_LEVEL = 'intermediate'
+
+class PaperPool:
+    """Interview papers pinned to their test_id.
+
+    The first request for a test_id takes a pre-generated spare paper for its domain,
+    each spare being handed out once, or generates one from a seed derived from the
+    test_id and PAPER_SEED_SECRET. The question ids are recorded in the session store,
+    so later requests return the same paper, whatever the bank version, in every process
+    and after a restart. Papers do not depend on the skill level, which is only recorded
+    with the session.
+    """
+
+    def __init__(self, service=None, size=Config.PAPER_POOL_SIZE, interval=Config.PAPER_POOL_REFRESH_INTERVAL,
+                 secret=Config.PAPER_SEED_SECRET, store=None):
+        self.service = service or QuestionService()
+        self.size = max(1, size)
+        self.interval = interval
+        self.secret = secret.encode('utf-8')
+        self.store = store or session_store
+        self.hits = 0
+        self.misses = 0
+        self.pinned = 0
+        self.last_warm_at = None
+        self.last_warm_seconds = None
+        # domain -> (bank version, deque of papers not handed out yet)
+        self._spares = {}
+        # Guards the spares and counters; paper(), pin() and warm() run on different threads
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='paper-pool', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        # Fill the spares right away, then top them up as they are handed out or the bank is reloaded
+        while not self._stop.is_set():
+            try:
+                if not self.is_warm():
+                    self.warm()
+            except Exception as e:
+                print(f"Error generating question papers: {str(e)}")
+            self._stop.wait(self.interval)
+
+    def paper(self, domain, skill_level, test_id=None):
+        """The paper pinned to test_id, assigned on first use; a fresh random paper without a test_id"""
+        bank = self.service.bank
+        if not test_id:
+            return self.service.get_questions_for_interview(domain, skill_level)
+
+        domain = bank.resolve_domain(domain) or 'ai_ml'
+        session = self.store.start(test_id, domain, _level(skill_level))
+        if session.served:
+            self._count('hits')
+            return _questions(bank, session.served)
+
+        paper = self._take_spare(bank, domain)
+        if paper is None:
+            self._count('misses')
+            paper = self._generate(domain, self._seed(test_id, domain))
+        else:
+            self._count('hits')
+        # A concurrent request or pin() may have assigned a paper meanwhile; the first one wins
+        return _questions(bank, self.store.assign(session, [q['id'] for q in paper]))
+
+    def pin(self, test_ids, domain, skill_level=None):
+        """Generate and record the papers of expected test_ids ahead of time; returns how many were new"""
+        bank = self.service.bank
+        domain = bank.resolve_domain(domain) or 'ai_ml'
+        pinned = 0
+        for test_id in dict.fromkeys(test_ids):
+            session = self.store.start(test_id, domain, _level(skill_level))
+            if session.served:
+                continue
+            paper = self._generate(domain, self._seed(test_id, domain))
+            question_ids = [q['id'] for q in paper]
+            if self.store.assign(session, question_ids) == question_ids:
+                pinned += 1
+        self._count('pinned', pinned)
+        return pinned
+
+    def warm(self, domains=None):
+        """Top up the spare papers of the given (default: all) domains; returns the count"""
+        started = time.perf_counter()
+        bank = self.service.bank
+        generated = 0
+        for domain in domains or bank.by_domain:
+            domain = bank.resolve_domain(domain) or 'ai_ml'
+            spares = self._spares_for(bank, domain)
+            while len(spares) < self.size:
+                # A fresh OS-seeded generator per spare: no two papers share a seed
+                spares.append(self._generate(domain, random.Random()))
+                generated += 1
+        self.last_warm_at = time.time()
+        self.last_warm_seconds = time.perf_counter() - started
+        return generated
+
+    def is_warm(self):
+        bank = self.service.bank
+        with self._lock:
+            return all(
+                domain in self._spares
+                and self._spares[domain][0] == bank.version
+                and len(self._spares[domain][1]) >= self.size
+                for domain in bank.by_domain
+            )
+
+    def _spares_for(self, bank, domain):
+        """Spare papers for the current bank version; spares from an older bank are dropped"""
+        with self._lock:
+            spares = self._spares.get(domain)
+            if spares is None or spares[0] != bank.version:
+                spares = self._spares[domain] = (bank.version, deque())
+            return spares[1]
+
+    def _take_spare(self, bank, domain):
+        try:
+            return self._spares_for(bank, domain).popleft()
+        except IndexError:
+            return None
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def _seed(self, test_id, domain):
+        """Generator seeded from the test_id, keyed with the deployment's secret so seeds cannot be guessed"""
+        message = f"{domain}:{test_id}".encode('utf-8')
+        return random.Random(hmac.new(self.secret, message, hashlib.sha256).digest())
+
+    def _generate(self, domain, rng):
+        # get_questions_for_interview draws the same way at every skill level
+        return tuple(self.service.get_questions_for_interview(domain, None, rng=rng))
+
+    def status(self):
+        with self._lock:
+            spares = [papers for _, papers in self._spares.values()]
+        return {
+            'pool_size': self.size,
+            'spare_papers': sum(len(papers) for papers in spares),
+            'pools': len(spares),
+            'warm': self.is_warm(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'pinned_ahead': self.pinned,
+            'last_warm_at': self.last_warm_at,
+            'last_warm_seconds': self.last_warm_seconds
+        }
+
+def _level(skill_level):
+    level = str(skill_level or '').lower()
+    return level if level in SKILL_LEVEL_PRIORS else DEFAULT_LEVEL
+
+def _questions(bank, question_ids):
+    """Pinned questions from the bank; ids a reload has since removed are skipped"""
+    return [question for question in map(bank.get, question_ids) if question is not None]
+
+paper_pool = PaperPool()
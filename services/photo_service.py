@@ -8,10 +8,11 @@ class PhotoService:
         self.upload_dir = "uploads/photos"
         os.makedirs(self.upload_dir, exist_ok=True)
 
-    def save_photo(self, file_content: bytes) -> str:
+    def save_photo(self, file_content) -> str:
+        """Save bytes or a readable image file object as a standardized JPEG"""
         try:
             # Validate image
-            img = Image.open(BytesIO(file_content))
+            img = Image.open(BytesIO(file_content) if isinstance(file_content, bytes) else file_content)
             
             # Generate unique filename
             filename = f"{uuid4()}.jpg"
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from config import Config
+from services.model_registry import model_registry
+
+# Difficulty spellings found in the banks, mapped to the canonical levels
+DIFFICULTY_ALIASES = {
+    'beginner': 'beginner',
+    'easy': 'beginner',
+    'intermediate': 'intermediate',
+    'medium': 'intermediate',
+    'advanced': 'advanced',
+    'expert': 'expert',
+    'hard': 'expert'
+}
+DEFAULT_DIFFICULTY = 'intermediate'
+
+# Interview tiers drawn from each difficulty level
+DIFFICULTY_TIERS = {
+    'beginner': 'easy',
+    'intermediate': 'medium',
+    'advanced': 'hard',
+    'expert': 'hard'
+}
+
+# Questions in one interview paper
+INTERVIEW_SIZE = 15
+
+# Domain names used by the API and models.candidate.Domain, mapped to data/ directories
+DOMAIN_ALIASES = {
+    'ai/ml': 'ai_ml',
+    'web development': 'web_dev',
+    'business analyst': 'business'
+}
+
+def normalize_question(raw, domain, source):
+    """Canonical question dict, or raise ValueError if the entry is unusable"""
+    if not isinstance(raw, dict):
+        raise ValueError("question entry is not an object")
+    if not raw.get('id') or not raw.get('question'):
+        raise ValueError(f"question {raw.get('id')!r} is missing 'id' or 'question'")
+
+    keywords = raw.get('expected_keywords', [])
+    if not isinstance(keywords, list):
+        raise ValueError(f"question {raw['id']!r} has non-list 'expected_keywords'")
+
+    difficulty = str(raw.get('difficulty') or DEFAULT_DIFFICULTY).strip().lower()
+    if difficulty not in DIFFICULTY_ALIASES:
+        raise ValueError(f"question {raw['id']!r} has unknown difficulty {raw.get('difficulty')!r}")
+
+    return {
+        'id': str(raw['id']),
+        'domain': domain,
+        'category': str(raw.get('category') or source).strip().lower(),
+        'difficulty': DIFFICULTY_ALIASES[difficulty],
+        'question': str(raw['question']).strip(),
+        'expected_keywords': [str(k) for k in keywords],
+        'source': source
+    }
+
+def read_question_file(file_path):
+    """Raw question entries from one bank file, which may be a list or {"questions": [...]}"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data['questions'] if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError("'questions' is not a list")
+    return entries
+
+def question_files(data_dir):
+    return sorted(Path(data_dir).glob('*/*.json'))
+
+def read_questions(data_dir=Config.QUESTION_DATA_DIR, errors=None):
+    """Read and normalise every data/<domain>/*.json file, skipping malformed entries.
+
+    Each problem is printed as a warning, or appended to errors when a list is given.
+    """
+    report = errors.append if errors is not None else lambda problem: print(f"Warning: Skipping {problem}")
+    questions = []
+    for file_path in question_files(data_dir):
+        relative = file_path.relative_to(data_dir).as_posix()
+        domain = file_path.parent.name.lower()
+        source = file_path.stem.split('_')[0].lower()
+        try:
+            entries = read_question_file(file_path)
+        except Exception as e:
+            report(f"{relative}: {str(e)}")
+            continue
+
+        for position, entry in enumerate(entries):
+            try:
+                questions.append(normalize_question(entry, domain, source))
+            except ValueError as e:
+                report(f"{relative}[{position}]: {str(e)}")
+    return questions
+
+def validate_questions(data_dir=Config.QUESTION_DATA_DIR):
+    """Every normalised question under data_dir, or raise ValueError listing every problem found"""
+    errors = []
+    questions = read_questions(data_dir, errors)
+    seen_ids = {}
+    for question in questions:
+        where = f"{question['domain']}/{question['source']} questions"
+        if question['id'] in seen_ids:
+            errors.append(f"duplicate id {question['id']!r} in {where} (first in {seen_ids[question['id']]})")
+        seen_ids.setdefault(question['id'], where)
+
+    if errors:
+        raise ValueError("Invalid question bank:\n" + "\n".join(errors))
+    return questions
+
+def question_fingerprint(questions):
+    """SHA-256 of the normalised questions; files derived from the bank record it to detect staleness"""
+    payload = json.dumps(list(questions), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def load_question_clusters(fingerprint, model_name=None, threshold=Config.QUESTION_DUPLICATE_THRESHOLD,
+                           path=Config.QUESTION_CLUSTERS_PATH):
+    """question id -> near-duplicate cluster id, or {} if the file is missing or does not match.
+
+    The file must have been built by build_question_clusters.py from the same questions,
+    with the same model and threshold; otherwise its clusters are ignored.
+    """
+    if not Path(path).exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Error loading question clusters from {path}: {str(e)}")
+        return {}
+
+    if model_name and data.get('model') != model_name:
+        print(f"Warning: Question clusters were built with {data.get('model')}, expected {model_name}; ignoring them")
+        return {}
+    if data.get('threshold') != threshold:
+        print(f"Warning: Question clusters were built with threshold {data.get('threshold')}, expected {threshold}; ignoring them")
+        return {}
+    if data.get('fingerprint') != fingerprint:
+        print(f"Warning: Question clusters in {path} are out of date, run build_question_clusters.py")
+        return {}
+    return data['clusters']
+
+class QuestionBank:
+    """Immutable, indexed view of every question under the data directory"""
+
+    def __init__(self, questions, version=1, clusters=None, fingerprint=None):
+        self.questions = tuple(questions)
+        self.version = version
+        self.loaded_at = time.time()
+        self.clusters = clusters or {}
+        self.fingerprint = fingerprint or question_fingerprint(self.questions)
+        by_domain = {}
+        by_category = {}
+        by_source = {}
+        by_difficulty = {}
+        by_domain_category = {}
+        by_level = {}
+        by_bucket = {}
+        for question in self.questions:
+            domain, category = question['domain'], question['category']
+            by_domain.setdefault(domain, []).append(question)
+            by_category.setdefault(category, []).append(question)
+            by_source.setdefault(question['source'], []).append(question)
+            by_difficulty.setdefault((domain, question['difficulty']), []).append(question)
+            by_domain_category.setdefault((domain, category), []).append(question)
+            by_level.setdefault((domain, category, question['difficulty']), []).append(question)
+            tier = DIFFICULTY_TIERS[question['difficulty']]
+            by_bucket.setdefault((domain, category, tier), []).append(question)
+
+        self.by_domain = _freeze(by_domain)
+        self.by_category = _freeze(by_category)
+        self.by_source = _freeze(by_source)
+        self.by_difficulty = _freeze(by_difficulty)
+        self.by_domain_category = _freeze(by_domain_category)
+        self.by_level = _freeze(by_level)
+        self.by_bucket = _freeze(by_bucket)
+        self.domain_categories = {
+            domain: tuple(dict.fromkeys(q['category'] for q in questions))
+            for domain, questions in self.by_domain.items()
+        }
+
+        # id -> (source, position) and id -> following question in the same bank file
+        self.by_id = {}
+        self.positions = {}
+        self.successors = {}
+        for source, questions in self.by_source.items():
+            for position, question in enumerate(questions):
+                if question['id'] in self.by_id:
+                    continue  # First occurrence wins, as the old linear scan did
+                self.by_id[question['id']] = question
+                self.positions[question['id']] = (source, position)
+                self.successors[question['id']] = questions[position + 1] if position + 1 < len(questions) else None
+
+    @classmethod
+    def load(cls, data_dir=Config.QUESTION_DATA_DIR):
+        """Bank of every question under data_dir, without near-duplicate clusters"""
+        return cls(read_questions(data_dir))
+
+    def __len__(self):
+        return len(self.questions)
+
+    def resolve_domain(self, domain):
+        """Map an API or candidate domain name onto a loaded domain, or None"""
+        key = str(domain).strip().lower()
+        key = DOMAIN_ALIASES.get(key, key)
+        return key if key in self.by_domain else None
+
+    def categories(self, domain):
+        return self.domain_categories.get(domain, ())
+
+    def in_domain_category(self, domain, category):
+        return self.by_domain_category.get((domain, category), ())
+
+    def at_level(self, domain, category, difficulty):
+        return self.by_level.get((domain, category, difficulty), ())
+
+    def bucket(self, domain, category, tier):
+        return self.by_bucket.get((domain, category, tier), ())
+
+    def get(self, question_id):
+        return self.by_id.get(question_id)
+
+    def cluster_of(self, question_id):
+        """Near-duplicate cluster of a question; unclustered questions are their own cluster"""
+        return self.clusters.get(question_id, question_id)
+
+    def next_question(self, question_id):
+        """The question after question_id in its bank file, or None"""
+        return self.successors.get(question_id)
+
+    def in_category(self, category):
+        """Questions by the legacy file-name key (e.g. 'python'), else by their own category
+
+        File names come first, as in the original lookup, so 'python' keeps meaning
+        python_questions.json rather than the "python" category of advanced_questions.json.
+        """
+        key = str(category).strip().lower()
+        return self.by_source.get(key) or self.by_category.get(key, ())
+
+def _freeze(index):
+    return {key: tuple(values) for key, values in index.items()}
+
+_bank = None
+_bank_lock = threading.Lock()
+
+def load_question_bank(questions=None, version=1):
+    """QuestionBank of questions (default: everything under data/) with the clusters built for them.
+
+    Without questions, a snapshot built by build_question_snapshot.py is used when it is
+    up to date with the JSON files, which skips parsing, normalising and fingerprinting them.
+    """
+    fingerprint = None
+    if questions is None:
+        from services.question_snapshot import load_snapshot
+        questions, fingerprint = load_snapshot() or (read_questions(), None)
+    questions = list(questions)
+    fingerprint = fingerprint or question_fingerprint(questions)
+    clusters = load_question_clusters(fingerprint, model_registry.model_id)
+    return QuestionBank(questions, version, clusters, fingerprint)
+
+def get_question_bank():
+    """The process-wide question bank, built on first use.
+
+    Callers should hold on to the returned bank for the whole request: a reload swaps
+    in a new bank object and never mutates the one already handed out.
+    """
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = load_question_bank()
+    return _bank
+
+def swap_question_bank(bank):
+    """Atomically replace the process-wide bank"""
+    global _bank
+    with _bank_lock:
+        _bank = bank
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from config import Config
+from services.category_pages import category_pages
+from services.question_bank import get_question_bank, load_question_bank, question_files, swap_question_bank, validate_questions
+from services.question_search import question_search
+
+class QuestionBankWatcher:
+    """Polls the data directory and swaps in a rebuilt question bank when files change"""
+
+    def __init__(self, data_dir=Config.QUESTION_DATA_DIR, interval=Config.QUESTION_RELOAD_INTERVAL):
+        self.data_dir = data_dir
+        self.interval = interval
+        self.reloads = 0
+        self.last_reload_at = None
+        self.last_reload_seconds = None
+        self.last_error = None
+        self._fingerprint = None
+        self._pending = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._fingerprint = _fingerprint(self.data_dir)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='question-bank-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"Error checking question files: {str(e)}")
+
+    def check(self):
+        """Reload if the files changed and have stayed unchanged for one more interval"""
+        fingerprint = _fingerprint(self.data_dir)
+        if fingerprint == self._fingerprint:
+            self._pending = None
+            return False
+        if fingerprint != self._pending:
+            # Editors often write in several steps; wait for the files to settle
+            self._pending = fingerprint
+            return False
+        return self.reload(fingerprint)
+
+    def reload(self, fingerprint=None):
+        """Rebuild the bank off the request path and swap it in; keeps the old bank on errors"""
+        fingerprint = fingerprint or _fingerprint(self.data_dir)
+        started = time.perf_counter()
+        try:
+            questions = validate_questions(self.data_dir)
+            bank = load_question_bank(questions, version=get_question_bank().version + 1)
+            # Clusters and the keyword store's per-question index are checked against the new
+            # bank's fingerprint and bypassed until rebuilt. Serialize the category listings and
+            # index the text before requests can see the new bank
+            category_pages.get(bank)
+            question_search.get(bank)
+        except Exception as e:
+            # Do not retry the same broken files every interval
+            self._fingerprint = fingerprint
+            self.last_error = str(e)
+            print(f"Warning: Question bank not reloaded: {str(e)}")
+            return False
+
+        swap_question_bank(bank)
+        self._fingerprint = fingerprint
+        self._pending = None
+        self.reloads += 1
+        self.last_reload_at = bank.loaded_at
+        self.last_reload_seconds = time.perf_counter() - started
+        self.last_error = None
+        print(f"Question bank reloaded: version {bank.version}, {len(bank)} questions")
+        return True
+
+    def status(self):
+        bank = get_question_bank()
+        return {
+            'version': bank.version,
+            'questions': len(bank),
+            'loaded_at': bank.loaded_at,
+            'watching': self._thread is not None,
+            'interval_seconds': self.interval,
+            'reloads': self.reloads,
+            'last_reload_at': self.last_reload_at,
+            'last_reload_seconds': self.last_reload_seconds,
+            'last_error': self.last_error
+        }
+
+def _fingerprint(data_dir):
+    fingerprint = []
+    for file_path in question_files(data_dir):
+        stat = file_path.stat()
+        fingerprint.append((str(file_path), stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+question_bank_watcher = QuestionBankWatcher()
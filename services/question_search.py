@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+import bisect
+import math
+import re
+import threading
+from services.lexical_scorer import TOKEN_PATTERN
+from services.question_bank import DIFFICULTY_ALIASES
+
+# "quoted phrase", prefix* or a plain term
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+# Position gap between the question text and each keyword so phrases never span fields
+FIELD_GAP = 1000
+# Matches in expected_keywords outrank matches in the question text
+KEYWORD_WEIGHT = 2.0
+
+class QuestionSearchIndex:
+    """Positional inverted index over question text and expected keywords of one bank"""
+
+    def __init__(self, bank):
+        self.version = bank.version
+        self.questions = bank.questions
+        # term -> {question number: (positions, ...)}
+        postings = {}
+        self.keyword_terms = []
+        for number, question in enumerate(self.questions):
+            fields = [question['question']] + question['expected_keywords']
+            keyword_terms = set()
+            for field, text in enumerate(fields):
+                for offset, term in enumerate(TOKEN_PATTERN.findall(text.lower())):
+                    postings.setdefault(term, {}).setdefault(number, []).append(field * FIELD_GAP + offset)
+                    if field:
+                        keyword_terms.add(term)
+            self.keyword_terms.append(frozenset(keyword_terms))
+        self.postings = {term: {n: tuple(p) for n, p in docs.items()} for term, docs in postings.items()}
+        self.terms = sorted(self.postings)
+
+    def search(self, query, domain=None, difficulty=None, limit=20, offset=0):
+        """(total matches, [(score, question), ...]) for every clause of query, best first"""
+        clauses = parse_query(query)
+        if not clauses:
+            raise ValueError("Query has no searchable terms")
+        if difficulty is not None:
+            level = DIFFICULTY_ALIASES.get(str(difficulty).strip().lower())
+            if level is None:
+                raise ValueError(f"Unknown difficulty {difficulty!r}")
+            difficulty = level
+
+        scores = None
+        # Rarest clauses first keeps the intersection small
+        for matches in sorted((self._match(clause) for clause in clauses), key=len):
+            if scores is None:
+                scores = dict(matches)
+            else:
+                scores = {n: scores[n] + score for n, score in matches.items() if n in scores}
+            if not scores:
+                return 0, []
+
+        results = []
+        for number, score in scores.items():
+            question = self.questions[number]
+            if domain is not None and question['domain'] != domain:
+                continue
+            if difficulty is not None and question['difficulty'] != difficulty:
+                continue
+            results.append((-score, number))
+        results.sort()
+        page = results[offset:offset + limit]
+        return len(results), [(-score, self.questions[number]) for score, number in page]
+
+    def _match(self, clause):
+        """question number -> score for one clause"""
+        kind, terms = clause
+        if kind == 'prefix':
+            start = bisect.bisect_left(self.terms, terms[0])
+            matches = {}
+            for term in self.terms[start:]:
+                if not term.startswith(terms[0]):
+                    break
+                for number, score in self._term_scores(term).items():
+                    matches[number] = max(matches.get(number, 0.0), score)
+            return matches
+        if len(terms) == 1:
+            return self._term_scores(terms[0])
+        return self._phrase_scores(terms)
+
+    def _term_scores(self, term):
+        docs = self.postings.get(term, {})
+        idf = self._idf(len(docs))
+        return {
+            number: idf * len(positions) * (KEYWORD_WEIGHT if term in self.keyword_terms[number] else 1.0)
+            for number, positions in docs.items()
+        }
+
+    def _phrase_scores(self, terms):
+        term_docs = [self.postings.get(term, {}) for term in terms]
+        candidates = set.intersection(*(set(docs) for docs in term_docs))
+        idf = sum(self._idf(len(docs)) for docs in term_docs)
+        matches = {}
+        for number in candidates:
+            following = [set(docs[number]) for docs in term_docs[1:]]
+            hits = sum(
+                1 for start in term_docs[0][number]
+                if all(start + i + 1 in positions for i, positions in enumerate(following))
+            )
+            if hits:
+                matches[number] = idf * hits
+        return matches
+
+    def _idf(self, df):
+        return math.log(1 + (len(self.questions) - df + 0.5) / (df + 0.5))
+
+def parse_query(query):
+    """[('term' | 'prefix' | 'phrase', (term, ...)), ...]"""
+    clauses = []
+    for phrase, word in QUERY_PATTERN.findall(str(query).lower()):
+        if phrase:
+            terms = tuple(TOKEN_PATTERN.findall(phrase))
+            if terms:
+                clauses.append(('phrase' if len(terms) > 1 else 'term', terms))
+            continue
+        prefix = word.endswith('*')
+        terms = TOKEN_PATTERN.findall(word)
+        if not terms:
+            continue
+        if prefix and len(terms) == 1:
+            clauses.append(('prefix', tuple(terms)))
+        elif len(terms) > 1:
+            # Punctuated words such as "scikit-learn" are searched as a phrase
+            clauses.append(('phrase', tuple(terms)))
+        else:
+            clauses.append(('term', tuple(terms)))
+    return clauses
+
+class QuestionSearchCache:
+    """Search index for the current bank, rebuilt once per bank version"""
+
+    def __init__(self):
+        self._index = None
+        self._lock = threading.Lock()
+
+    def get(self, bank):
+        index = self._index
+        if index is None or index.version != bank.version:
+            with self._lock:
+                index = self._index
+                if index is None or index.version != bank.version:
+                    index = self._index = QuestionSearchIndex(bank)
+        return index
+
+question_search = QuestionSearchCache()
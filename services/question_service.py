@@ -1,81 +1,142 @@
 # -*- coding: utf-8 -*-
-import json
-import os
-from pathlib import Path
 import random
 from typing import List
+from services.adaptive_service import adaptive_selector
+from services.lexical_scorer import LexicalScorer
+from services.question_bank import INTERVIEW_SIZE, get_question_bank
+from services.session_scoring import session_scores
+from services.session_store import session_store
+
+# Questions per tier for every 5 drawn from a category (2 easy, 2 medium, 1 hard)
+TIER_MIX = (('easy', 2), ('medium', 2), ('hard', 1))
 
 class QuestionService:
-    def __init__(self):
-        self.questions_cache = {}
-        self.load_questions()
-    
-    def load_questions(self):
-        """Load questions from JSON files"""
-        categories = ['ai_ml', 'web_dev']
-        for category in categories:
-            path = Path(f'data/{category}')
-            if not path.exists():
-                print(f"Warning: Directory {path} does not exist")
-                continue
-                
-            try:
-                for file_path in path.glob('*.json'):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            category_name = file_path.stem.split('_')[0]  # Get category from filename
-                            self.questions_cache[category_name] = data['questions']
-                    except Exception as e:
-                        print(f"Error loading {file_path}: {str(e)}")
-            except Exception as e:
-                print(f"Error accessing directory {path}: {str(e)}")
+    def __init__(self, bank=None):
+        self._bank = bank
+        self.lexical_scorer = LexicalScorer()
+
+    @property
+    def bank(self):
+        # Read the shared bank on every call so a reloaded bank is picked up
+        return self._bank or get_question_bank()
     
     def get_questions_by_category(self, category):
         """Get questions for a specific category"""
-        if category not in self.questions_cache:
-            return []  # Return empty list instead of raising exception
-        return self.questions_cache[category]
+        return list(self.bank.in_category(category))
     
-    def get_next_question(self, previous_question_id, answer):
-        """Get next question based on previous answer"""
+    def get_next_question(self, previous_question_id, answer, test_id=None, domain=None,
+                          skill_level=None, score=None):
+        """Get next question based on previous answer; adaptive when a test_id is given"""
+        bank = self.bank
+        if test_id:
+            return self._next_adaptive_question(bank, test_id, previous_question_id, answer,
+                                                domain, skill_level, score)
+
         if not previous_question_id:
             # If no previous question, return first question from any category
-            for questions in self.questions_cache.values():
-                if questions:
-                    return questions[0]
-            return None
+            return bank.questions[0] if bank.questions else None
             
-        # Find next question in sequence
-        for questions in self.questions_cache.values():
-            for i, q in enumerate(questions):
-                if q['id'] == previous_question_id and i + 1 < len(questions):
-                    return questions[i + 1]
-        return None
+        # Precomputed successor link, a dictionary lookup whatever the bank size
+        return bank.next_question(previous_question_id)
 
-    def get_questions_for_interview(self, domain: str, skill_level: str) -> List[dict]:
-        """Get 15 questions (5 easy, 5 medium, 5 hard)"""
-        questions = []
-        
-        # Load questions based on domain
-        if domain == 'web_dev':
-            categories = ['html', 'css', 'javascript']
-        else:  # ai_ml
-            categories = ['ai', 'ml', 'advanced']
+    def _next_adaptive_question(self, bank, test_id, previous_question_id, answer, domain, skill_level, score):
+        resolved = bank.resolve_domain(domain) if domain else None
+        if domain and resolved is None:
+            raise ValueError(f"Unknown domain {domain!r}")
+        stored = session_store.get(test_id)
+        if stored is None:
+            if resolved is None:
+                raise ValueError(f"domain is required on the first call for test {test_id}")
+            stored = session_store.start(test_id, resolved, skill_level)
+        session = adaptive_selector.get(test_id)
+        if session is None:
+            session = self._restore_adaptive_session(bank, test_id, stored, resolved)
+
+        previous = bank.get(previous_question_id) if previous_question_id else None
+        # A resubmitted previous_question_id must not move the ability estimate twice
+        if previous is not None and previous['id'] in session.served and previous['id'] not in session.scored:
+            if score is None:
+                score = self._answer_score(test_id, previous, answer)
+            if adaptive_selector.record(session, previous, score):
+                session_store.record_answer(stored, previous['id'], answer, score)
+
+        question = adaptive_selector.next_question(session, bank)
+        if question is not None:
+            session_store.serve(stored, [question['id']])
+        return question
 
+    def _restore_adaptive_session(self, bank, test_id, stored, domain=None):
+        """Start the adaptive session, replaying what the store recorded before an eviction or restart"""
+        # Sessions opened by the evaluation endpoints carry no domain of their own
+        domain = (bank.resolve_domain(stored.domain) if stored.domain else None) or domain
+        if domain is None:
+            raise ValueError(f"domain is required on the first call for test {test_id}")
+        session = adaptive_selector.start(test_id, bank, domain, stored.skill_level)
+        for question_id in stored.served:
+            question = bank.get(question_id)
+            if question is None or question['category'] not in session.asked:
+                continue
+            adaptive_selector.mark_served(session, bank, question)
+            _, score = stored.answers.get(question_id, (None, None))
+            if score is not None:
+                adaptive_selector.record(session, question, score)
+        return session
+
+    def _answer_score(self, test_id, question, answer):
+        """Score already recorded by the evaluation endpoint, else a quick lexical score"""
+        scored = session_scores.get(test_id)
+        if scored is not None and question['id'] in scored.scores:
+            return scored.scores[question['id']]
+        return float(self.lexical_scorer.score_answers([{
+            'answer': answer,
+            'expected_keywords': question['expected_keywords']
+        }])[0])
+
+    def get_questions_for_interview(self, domain: str, skill_level: str, rng=random) -> List[dict]:
+        """Get 15 questions, drawn 2:2:1 easy/medium/hard from each category of the domain
+
+        Pass a seeded random.Random as rng to draw the same paper again.
+        """
+        bank = self.bank
+        # Unknown domains fall back to AI/ML as before
+        domain = bank.resolve_domain(domain) or 'ai_ml'
+        categories = bank.categories(domain)
+        if not categories:
+            return []
+
+        # Domains with fewer categories draw more from each so the paper stays full
+        per_category = -(-INTERVIEW_SIZE // len(categories))
+        questions = []
+        # At most one question per near-duplicate cluster in a paper
+        used_clusters = set()
         for category in categories:
-            category_questions = self.questions_cache.get(category, [])
-            
-            # Filter by difficulty
-            easy = [q for q in category_questions if q['difficulty'] == 'beginner']
-            medium = [q for q in category_questions if q['difficulty'] == 'intermediate']
-            hard = [q for q in category_questions if q['difficulty'] == 'expert']
-            
-            # Select questions
-            questions.extend(random.sample(easy, min(2, len(easy))))
-            questions.extend(random.sample(medium, min(2, len(medium))))
-            questions.extend(random.sample(hard, min(1, len(hard))))
+            picked = []
+            for tier, weight in TIER_MIX:
+                pool = bank.bucket(domain, category, tier)
+                picked.extend(_draw(rng, bank, pool, round(per_category * weight / 5), used_clusters))
+
+            # Top up from other tiers when a category lacks some difficulty levels
+            picked.extend(_draw(rng, bank, bank.in_domain_category(domain, category), per_category - len(picked),
+                                used_clusters))
+            questions.extend(picked)
+        questions.extend(_draw(rng, bank, bank.by_domain[domain], INTERVIEW_SIZE - len(questions), used_clusters))
         
         # Shuffle questions
-        random.shuffle(questions)
-        return questions[:15] 
\ No newline at end of file
+        rng.shuffle(questions)
+        return questions[:INTERVIEW_SIZE]
+
+def _draw(rng, bank, pool, count, used_clusters):
+    """Up to count random questions from pool whose clusters are not in used_clusters yet"""
+    picked = []
+    if count <= 0 or not pool:
+        return picked
+    # A small oversample covers skipped duplicates without shuffling the whole pool
+    for question in rng.sample(pool, min(count * 3 + len(used_clusters), len(pool))):
+        cluster = bank.cluster_of(question['id'])
+        if cluster in used_clusters:
+            continue
+        used_clusters.add(cluster)
+        picked.append(question)
+        if len(picked) == count:
+            break
+    return picked
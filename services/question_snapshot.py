@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import struct
+import numpy as np
+from config import Config
+from services.question_bank import question_files, question_fingerprint, validate_questions
+
+MAGIC = b'QBNK'
+VERSION = 2
+PREAMBLE = struct.Struct('<4sIQ')  # magic, version, header length
+STRING_COLUMNS = ('id', 'domain', 'category', 'difficulty', 'question', 'source')
+SEPARATOR = '\0'
+
+def build_snapshot(data_dir=Config.QUESTION_DATA_DIR, path=Config.QUESTION_SNAPSHOT_PATH):
+    """Validate every question file and write them as one interned, columnar snapshot.
+
+    Raises ValueError listing every problem found, so a bad bank never reaches the server.
+    """
+    questions = validate_questions(data_dir)
+
+    # Every string is stored once; columns hold indexes into the string table
+    strings = {}
+    def intern(value):
+        if SEPARATOR in value:
+            raise ValueError(f"Invalid question bank: {value[:40]!r} contains a NUL character")
+        return strings.setdefault(value, len(strings))
+
+    arrays = {
+        name: np.array([intern(q[name]) for q in questions], dtype=np.int32)
+        for name in STRING_COLUMNS
+    }
+    arrays['keyword_ids'] = np.array([intern(k) for q in questions for k in q['expected_keywords']], dtype=np.int32)
+    arrays['keyword_offsets'] = np.cumsum([0] + [len(q['expected_keywords']) for q in questions], dtype=np.int64)
+    # One separated blob, so loading decodes the whole table in a single call
+    arrays['string_data'] = np.frombuffer(SEPARATOR.join(strings).encode('utf-8'), dtype=np.uint8)
+
+    specs = {}
+    offset = 0
+    for name, array in arrays.items():
+        specs[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _align(offset + array.nbytes)
+
+    header = json.dumps({
+        'count': len(questions),
+        # Recorded so loading does not have to serialise every question to hash it
+        'fingerprint': question_fingerprint(questions),
+        'sources': {p.relative_to(data_dir).as_posix(): _file_signature(p) for p in question_files(data_dir)},
+        'arrays': specs
+    }).encode('utf-8')
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        data_start = _align(PREAMBLE.size + len(header))
+        for name, array in arrays.items():
+            f.seek(data_start + specs[name]['offset'])
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)  # Readers never see a half-written snapshot
+    return len(questions), len(strings)
+
+def load_snapshot(path=Config.QUESTION_SNAPSHOT_PATH, data_dir=Config.QUESTION_DATA_DIR):
+    """(questions, fingerprint) from a memory-mapped snapshot; None if missing or older than the JSON files"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            magic, version, header_length = PREAMBLE.unpack(f.read(PREAMBLE.size))
+            if magic != MAGIC or version != VERSION:
+                print(f"Warning: {path} is not a version {VERSION} question snapshot, run build_question_snapshot.py")
+                return None
+            header = json.loads(f.read(header_length))
+
+        if not _sources_match(header['sources'], data_dir):
+            print(f"Warning: {path} is out of date, run build_question_snapshot.py")
+            return None
+
+        raw = np.memmap(path, dtype=np.uint8, mode='r')
+        data_start = _align(PREAMBLE.size + header_length)
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            start = data_start + spec['offset']
+            count = int(np.prod(spec['shape']))
+            arrays[name] = raw[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+        return _questions_from_arrays(arrays), header['fingerprint']
+    except Exception as e:
+        print(f"Error loading question snapshot {path}: {str(e)}")
+        return None
+
+def _questions_from_arrays(arrays):
+    strings = arrays['string_data'].tobytes().decode('utf-8').split(SEPARATOR)
+    # Repeated values (domains, categories, keywords) come back as one shared str each
+    columns = [[strings[i] for i in arrays[name].tolist()] for name in STRING_COLUMNS]
+    keywords = [strings[i] for i in arrays['keyword_ids'].tolist()]
+    offsets = arrays['keyword_offsets'].tolist()
+    return [
+        {
+            'id': question_id,
+            'domain': domain,
+            'category': category,
+            'difficulty': difficulty,
+            'question': text,
+            'expected_keywords': keywords[start:end],
+            'source': source
+        }
+        for question_id, domain, category, difficulty, text, source, start, end
+        in zip(*columns, offsets, offsets[1:])
+    ]
+
+def _file_signature(file_path):
+    stat = file_path.stat()
+    return {
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': hashlib.sha256(file_path.read_bytes()).hexdigest()
+    }
+
+def _sources_match(sources, data_dir):
+    """True if the data directory holds exactly the files the snapshot was built from, unchanged"""
+    files = {p.relative_to(data_dir).as_posix(): p for p in question_files(data_dir)}
+    if set(files) != set(sources):
+        return False
+    for relative, file_path in files.items():
+        expected = sources[relative]
+        stat = file_path.stat()
+        if stat.st_mtime_ns == expected['mtime_ns'] and stat.st_size == expected['size']:
+            continue
+        # Touched but possibly unchanged: fall back to comparing content
+        if hashlib.sha256(file_path.read_bytes()).hexdigest() != expected['sha256']:
+            return False
+    return True
+
+def _align(offset, alignment=8):
+    return (offset + alignment - 1) // alignment * alignment
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from config import Config
+from services.resume_service import ResumeService
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_resumes (
+    sha256 TEXT NOT NULL,
+    parser_version INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    parsed TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    skill_level TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (sha256, parser_version)
+);
+"""
+
+class ResumeCache:
+    """Parsed resumes keyed by the SHA-256 of the file, persisted in SQLite.
+
+    Entries written by another ResumeService.PARSER_VERSION are ignored, so a parser
+    change re-parses files instead of serving stale results.
+    """
+
+    def __init__(self, db_path=Config.RESUME_CACHE_PATH, parser_version=ResumeService.PARSER_VERSION):
+        self.db_path = db_path
+        self.parser_version = parser_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+
+    @property
+    def db(self):
+        """The SQLite connection, opened on first use; None when the cache is disabled"""
+        if self._db is None and self.db_path:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def get(self, sha256):
+        """{'path', 'parsed', 'domain', 'skill_level'} for a file hash, or None"""
+        with self._lock:
+            if self.db is None:
+                return None
+            row = self.db.execute(
+                'SELECT path, parsed, domain, skill_level FROM parsed_resumes WHERE sha256 = ? AND parser_version = ?',
+                (sha256, self.parser_version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        path, parsed, domain, skill_level = row
+        return {'path': path, 'parsed': json.loads(parsed), 'domain': domain, 'skill_level': skill_level}
+
+    def put(self, sha256, entry):
+        with self._lock:
+            if self.db is None:
+                return
+            self.db.execute(
+                'INSERT OR REPLACE INTO parsed_resumes VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (sha256, self.parser_version, entry['path'], json.dumps(entry['parsed']),
+                 entry['domain'], entry['skill_level'], time.time())
+            )
+
+    def status(self):
+        entries = 0
+        with self._lock:
+            if self.db is not None:
+                entries = self.db.execute('SELECT COUNT(*) FROM parsed_resumes WHERE parser_version = ?',
+                                          (self.parser_version,)).fetchone()[0]
+        return {
+            'persistent': bool(self.db_path),
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+resume_cache = ResumeCache()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import zipfile
+from config import Config
+from services.resume_cache import resume_cache
+from services.resume_pool import bulk_resume_pool, resume_pool
+from services.resume_service import ResumeService
+
+RESUME_EXTENSIONS = ('.pdf', '.doc', '.docx')
+
+class ArchiveTooLarge(ValueError):
+    """Raised when a bulk archive holds too many files or too many uncompressed bytes"""
+
+class ResumeIngest:
+    """Hash, cache lookup, content-addressed storage and parsing of uploaded resumes"""
+
+    def __init__(self, service=None, pool=None, bulk_pool=None, cache=None):
+        self.service = service or ResumeService()
+        self.pool = pool or resume_pool
+        self.bulk_pool = bulk_pool or bulk_resume_pool
+        self.cache = cache or resume_cache
+
+    async def analyze(self, source, filename, request=None, pool=None):
+        """Stored path, parsed data, domain and skill level of a resume file object, cached by SHA-256"""
+        # Hash first: an identical file needs neither storing nor parsing
+        scanned = await asyncio.to_thread(self.service.scan_upload, source)
+        analysis = self.cache.get(scanned.sha256)
+        if analysis is not None and os.path.exists(analysis['path']):
+            return {**analysis, 'sha256': scanned.sha256, 'cached': True}
+
+        # Streamed to disk in chunks, stopping as soon as it passes the size limit
+        stored = await asyncio.to_thread(self.service.save_upload, source, filename)
+        cached = analysis is not None
+        if analysis is None:
+            # Parsed off the event loop, straight from the stored file
+            try:
+                parsed = await (pool or self.pool).parse_resume(stored.path, request)
+            except Exception:
+                # Do not keep files that could not be parsed
+                if os.path.exists(stored.path):
+                    os.remove(stored.path)
+                raise
+            analysis = {
+                'parsed': parsed,
+                'domain': self.service.determine_domain(parsed['skills']),
+                'skill_level': self.service.determine_skill_level(parsed['experience'], parsed['skills'])
+            }
+        # A cached entry whose file was removed only needs the file written back
+        analysis['path'] = stored.path
+        self.cache.put(stored.sha256, analysis)
+        return {**analysis, 'sha256': stored.sha256, 'cached': cached}
+
+    async def analyze_many(self, files, concurrency=None):
+        """Yield one result dict per (name, open_file) as each finishes; failures become error results"""
+        # Two jobs per worker keep every core busy while the next file is being stored
+        concurrency = concurrency or self.bulk_pool.workers * 2
+        running = set()
+        try:
+            for name, open_file in files:
+                if len(running) >= concurrency:
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                running.add(asyncio.ensure_future(self._analyze_file(name, open_file)))
+            while running:
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The consumer went away, e.g. the client disconnected mid-stream
+            for task in running:
+                task.cancel()
+
+    async def _analyze_file(self, name, open_file):
+        if os.path.splitext(name)[1].lower() not in RESUME_EXTENSIONS:
+            return {'file': name, 'error': f"Unsupported file type. Allowed types: {', '.join(RESUME_EXTENSIONS)}"}
+        try:
+            with open_file() as source:
+                analysis = await self.analyze(source, name, pool=self.bulk_pool)
+        except Exception as e:
+            return {'file': name, 'error': str(e) or type(e).__name__}
+        return {
+            'file': name,
+            'sha256': analysis['sha256'],
+            'cached': analysis['cached'],
+            'skills': analysis['parsed']['skills'],
+            'experience': analysis['parsed']['experience'],
+            'education': analysis['parsed']['education'],
+            'domain': analysis['domain'],
+            'skill_level': analysis['skill_level']
+        }
+
+def check_archive(archive, max_members=Config.MAX_BULK_MEMBERS, max_uncompressed=Config.MAX_BULK_UNCOMPRESSED_BYTES):
+    """Reject an open ZipFile before anything is extracted, using the sizes its directory declares.
+
+    zipfile never inflates a member past its declared size, so the declared total bounds
+    what the batch can decompress.
+    """
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    if len(members) > max_members:
+        raise ArchiveTooLarge(f"Archive holds {len(members)} files, the limit is {max_members}")
+    uncompressed = sum(info.file_size for info in members)
+    if uncompressed > max_uncompressed:
+        raise ArchiveTooLarge(
+            f"Archive expands to {uncompressed // (1024 * 1024)}MB, the limit is {max_uncompressed // (1024 * 1024)}MB"
+        )
+
+def zip_files(archive):
+    """(name, open_file) for every file in an open ZipFile"""
+    return [
+        (info.filename, lambda info=info: archive.open(info))
+        for info in archive.infolist()
+        if not info.is_dir() and not os.path.basename(info.filename).startswith('.')
+    ]
+
+def directory_files(path):
+    """(relative name, open_file) for every file under a directory, in sorted order"""
+    files = []
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+        for name in sorted(names):
+            if name.startswith('.'):
+                continue
+            full_path = os.path.join(root, name)
+            files.append((os.path.relpath(full_path, path), lambda full_path=full_path: open(full_path, 'rb')))
+    return files
+
+def open_batch(path):
+    """(name, open_file) pairs from a zip archive or a directory, plus the ZipFile to close, if any"""
+    if os.path.isdir(path):
+        return directory_files(path), None
+    if zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        return zip_files(archive), archive
+    raise ValueError(f"{path} is neither a directory nor a zip archive")
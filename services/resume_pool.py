@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from services import resume_worker
+from services.resume_service import ResumeService
+from services.worker_processes import spawn_pool
+
+# How often a waiting request checks whether its client has gone away
+DISCONNECT_POLL_SECONDS = 0.5
+
+class ResumePoolBusy(Exception):
+    """Raised when the parse queue is full"""
+
+class ResumeParseTimeout(Exception):
+    """Raised when a parse does not finish within the pool timeout"""
+
+class ResumeParseCancelled(Exception):
+    """Raised when the client disconnected before its parse finished"""
+
+class ResumePool:
+    """Runs ResumeService.parse_resume off the event loop, in worker threads or processes.
+
+    Jobs still waiting in the queue are cancelled on timeout or client disconnect. A job
+    already running cannot be interrupted, so it keeps its queue slot until it finishes
+    and the queue limit always reflects real parsing load.
+    """
+
+    def __init__(self, executor=Config.RESUME_PARSE_EXECUTOR, workers=Config.RESUME_PARSE_WORKERS,
+                 queue_size=Config.RESUME_PARSE_QUEUE, timeout=Config.RESUME_PARSE_TIMEOUT, service=None):
+        if executor not in ('thread', 'process'):
+            raise ValueError(f"Unknown resume parse executor {executor!r}, expected 'thread' or 'process'")
+        self.executor = executor
+        self.workers = max(1, workers)
+        self.max_pending = self.workers * queue_size
+        self.timeout = timeout
+        self.service = service
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self._executor = None
+        self._ready = None  # Worker processes whose ResumeService is built
+        # Done callbacks run on worker threads
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._executor is not None:
+            return
+        if self.executor == 'process':
+            # Spawn rather than fork, like the evaluation pool; each worker runs services.resume_worker
+            # as its __main__ and builds its own ResumeService
+            context = multiprocessing.get_context('spawn')
+            self._ready = context.Value('i', 0)
+            self._executor = spawn_pool(self.workers, resume_worker, (self._ready,), context)
+        else:
+            self.service = self.service or ResumeService()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='resume-parse')
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def parse_resume(self, filepath, request=None):
+        """Parsed resume dict; request, if given, is polled so a disconnect cancels the job"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise ResumePoolBusy("Too many resumes are being parsed, please retry shortly")
+            self.pending += 1
+
+        try:
+            self.start()
+            if self.executor == 'process':
+                future = self._executor.submit(resume_worker.parse_resume, filepath)
+            else:
+                future = self._executor.submit(self.service.parse_resume, filepath)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        waiter = asyncio.wrap_future(future)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise ResumeParseTimeout(f"Resume parsing took longer than {self.timeout:g}s")
+                done, _ = await asyncio.wait({waiter}, timeout=min(DISCONNECT_POLL_SECONDS, remaining))
+                if done:
+                    return waiter.result()
+                if request is not None and await request.is_disconnected():
+                    self.cancelled += 1
+                    raise ResumeParseCancelled("Client disconnected")
+        finally:
+            # No-op once the job is running or done
+            future.cancel()
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+            if future is not None and not future.cancelled():
+                self.completed += 1
+
+    def status(self):
+        return {
+            'executor': self.executor,
+            'workers': self.workers,
+            'ready_workers': self._ready.value if self._ready is not None else None,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'timeout_seconds': self.timeout,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'cancelled': self.cancelled
+        }
+
+resume_pool = ResumePool()
+# Bulk ingestion parses on every core without taking slots from interactive uploads
+bulk_resume_pool = ResumePool(executor='process', workers=Config.RESUME_BULK_WORKERS)
@@ -3,15 +3,19 @@ import re
 from typing import BinaryIO, Dict, List
 import PyPDF2
 from docx import Document
-import magic
 import io
 import os
 import fitz  # PyMuPDF
 import docx
 from uuid import uuid4
 from datetime import datetime
+from config import Config
+from services.skill_taxonomy import DEFAULT_DOMAIN, SKILL_TAXONOMY, get_skill_matcher
+from services.upload_service import UnsupportedFileType, upload_service
 
 class ResumeService:
+    # Bump when parsing or domain/skill level rules change, so cached results are not reused
+    PARSER_VERSION = 3
     ALLOWED_MIME_TYPES = [
         'application/pdf',
         'application/msword',  # .doc
@@ -20,12 +24,8 @@ class ResumeService:
     
     def __init__(self):
         self.nlp = None
-        self.web_dev_keywords = {
-            'html', 'css', 'javascript', 'react', 'angular', 'vue', 'node', 'frontend', 'backend'
-        }
-        self.ai_ml_keywords = {
-            'machine learning', 'ai', 'deep learning', 'neural networks', 'python', 'tensorflow', 'pytorch'
-        }
+        # Every domain's skills and synonyms, compiled into one pattern
+        self.skill_matcher = get_skill_matcher()
         try:
             import spacy
             self.nlp = spacy.load("en_core_web_sm")
@@ -35,8 +35,8 @@ class ResumeService:
         os.makedirs(self.upload_dir, exist_ok=True)
 
     def validate_file(self, file_content: bytes) -> bool:
-        mime = magic.Magic(mime=True)
-        file_type = mime.from_buffer(file_content)
+        # libmagic only looks at the head of the file
+        file_type = upload_service.sniff(file_content[:64 * 1024])
         return file_type in self.ALLOWED_MIME_TYPES
 
     def save_resume(self, file_content: bytes, original_filename: str) -> str:
@@ -53,6 +53,22 @@ class ResumeService:
         
         return filepath
 
+    def save_upload(self, source: BinaryIO, original_filename: str, max_bytes: int = Config.MAX_RESUME_SIZE):
+        """Stream an uploaded file object to the upload directory, named by its SHA-256; returns a StoredUpload"""
+        ext = os.path.splitext(original_filename)[1].lower()
+        try:
+            return upload_service.store(source, self.upload_dir, ext, max_bytes, self.ALLOWED_MIME_TYPES,
+                                        content_addressed=True)
+        except UnsupportedFileType:
+            raise ValueError("Invalid file format. Only PDF, DOC, and DOCX files are allowed.")
+
+    def scan_upload(self, source: BinaryIO, max_bytes: int = Config.MAX_RESUME_SIZE):
+        """Size limit, MIME check and SHA-256 of an uploaded file object, without storing it"""
+        try:
+            return upload_service.scan(source, max_bytes, self.ALLOWED_MIME_TYPES)
+        except UnsupportedFileType:
+            raise ValueError("Invalid file format. Only PDF, DOC, and DOCX files are allowed.")
+
     def parse_resume(self, filepath: str) -> Dict:
         ext = os.path.splitext(filepath)[1].lower()
         
@@ -80,18 +96,13 @@ class ResumeService:
         # This is a basic implementation - you might want to use more sophisticated
         # NLP techniques or regex patterns for better extraction
         return {
-            "skills": self._extract_skills(text),
+            "skills": self.skill_matcher.find(text),
             "education": self._extract_education(text),
             "experience": self._extract_experience(text),
             "projects": self._extract_projects(text)
         }
 
     # Add methods to extract specific information
-    def _extract_skills(self, text: str) -> List[str]:
-        # Implement skill extraction logic
-        # This is a placeholder implementation
-        return []
-
     def _extract_education(self, text: str) -> List[Dict]:
         # Implement education extraction logic
         return []
@@ -183,15 +194,6 @@ class ResumeService:
             return section.strip()
         return ""
 
-    def _basic_extract_skills(self, text):
-        """Basic skill extraction without spaCy"""
-        common_skills = ['python', 'java', 'javascript', 'html', 'css', 'sql', 'react', 'angular', 'node']
-        found_skills = []
-        for skill in common_skills:
-            if re.search(r'\b' + skill + r'\b', text.lower()):
-                found_skills.append(skill)
-        return found_skills
-
     def _basic_extract_experience(self, text):
         """Basic experience extraction without spaCy"""
         experiences = []
@@ -211,11 +213,12 @@ class ResumeService:
         return education[:3]
 
     def determine_domain(self, skills: List[str]) -> str:
-        """Determine if candidate is web dev or AI/ML"""
-        web_dev_count = sum(1 for skill in skills if skill.lower() in self.web_dev_keywords)
-        ai_ml_count = sum(1 for skill in skills if skill.lower() in self.ai_ml_keywords)
-        
-        return 'web_dev' if web_dev_count > ai_ml_count else 'ai_ml'
+        """Domain whose taxonomy matches the most skills; AI/ML when none match"""
+        counts = self.skill_matcher.domain_counts(skills)
+        if not counts:
+            return DEFAULT_DOMAIN
+        # Ties go to the domain listed first in the taxonomy
+        return max(SKILL_TAXONOMY, key=lambda domain: counts.get(domain, 0))
 
     def determine_skill_level(self, experience: List[str], skills: List[str]) -> str:
         """Determine candidate's skill level"""
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Code run inside resume parsing worker processes.
+
+Workers are spawned with this module standing in for __main__, so they import only
+what parsing needs and never the app, its routes or the proctoring models.
+"""
+from services.resume_service import ResumeService
+
+_service = None
+
+def init_worker(ready):
+    """Build the worker's ResumeService, then report to the parent"""
+    global _service
+    _service = ResumeService()
+    with ready.get_lock():
+        ready.value += 1
+
+def started():
+    """No-op job; submitting one per worker makes the executor start every process"""
+    return None
+
+def parse_resume(filepath):
+    return _service.parse_resume(filepath)
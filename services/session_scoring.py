@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import threading
+from services.session_store import session_store
+
+STRENGTH_THRESHOLD = 0.7
+WEAKNESS_THRESHOLD = 0.4
+
+class SessionScore:
+    """Running evaluation of one interview, updated as each answer is scored"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.scores = {}  # question key -> score
+        self.category_totals = {}  # category -> [total, count]
+        self.categories = {}  # question key -> category
+        self.strengths = {}  # question key -> label, insertion ordered
+        self.weaknesses = {}
+
+    @property
+    def answered(self):
+        return len(self.scores)
+
+    @property
+    def average(self):
+        return self.total / len(self.scores) if self.scores else 0.0
+
+    def add(self, key, label, category, score):
+        """Record a scored answer; re-answering a question replaces its earlier score"""
+        if key in self.scores:
+            self._remove(key)
+
+        self.scores[key] = score
+        self.categories[key] = category
+        self.total += score
+        totals = self.category_totals.setdefault(category, [0.0, 0])
+        totals[0] += score
+        totals[1] += 1
+
+        if score >= STRENGTH_THRESHOLD:
+            self.strengths[key] = f"Strong understanding of {label}"
+        elif score <= WEAKNESS_THRESHOLD:
+            self.weaknesses[key] = f"Need improvement in {label}"
+
+    def _remove(self, key):
+        score = self.scores.pop(key)
+        category = self.categories.pop(key)
+        self.total -= score
+        totals = self.category_totals[category]
+        totals[0] -= score
+        totals[1] -= 1
+        if not totals[1]:
+            del self.category_totals[category]
+        self.strengths.pop(key, None)
+        self.weaknesses.pop(key, None)
+
+    def category_scores(self):
+        return {category: total / count for category, (total, count) in self.category_totals.items()}
+
+class SessionScores:
+    """Thread-safe map of test_id -> SessionScore for interviews in progress"""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def record(self, test_id, key, label, category, score):
+        with self._lock:
+            session = self._sessions.setdefault(test_id, SessionScore())
+            session.add(key, label, category, score)
+            return session
+
+    def get(self, test_id):
+        with self._lock:
+            return self._sessions.get(test_id)
+
+    def pop(self, test_id):
+        with self._lock:
+            return self._sessions.pop(test_id, None)
+
+session_scores = SessionScores()
+# Running scores leave memory with their session; they are rebuilt from the store on demand
+session_store.add_eviction_listener(session_scores.pop)
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    test_id TEXT PRIMARY KEY,
+    domain TEXT,
+    skill_level TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS served (
+    test_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    PRIMARY KEY (test_id, position)
+);
+CREATE TABLE IF NOT EXISTS answers (
+    test_id TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    answer TEXT,
+    score REAL,
+    PRIMARY KEY (test_id, question_id)
+);
+"""
+
+class InterviewSession:
+    """Questions served to one interview and the answers submitted so far"""
+
+    def __init__(self, test_id, domain=None, skill_level=None, created_at=None):
+        self.test_id = test_id
+        self.domain = domain
+        self.skill_level = skill_level
+        self.created_at = created_at or time.time()
+        self.served = []  # question ids in the order they were served
+        self.answers = {}  # question id -> (answer, score or None), insertion ordered
+
+    def to_dict(self):
+        return {
+            'test_id': self.test_id,
+            'domain': self.domain,
+            'skill_level': self.skill_level,
+            'created_at': self.created_at,
+            'served': list(self.served),
+            'answered': len(self.answers)
+        }
+
+class SessionStore:
+    """Interview sessions keyed by test_id.
+
+    Active sessions live in memory and are evicted after ttl seconds without use, by a
+    background sweep as well as on every insert. Every change is written through to
+    SQLite on a single writer thread, so requests never wait on a commit, and an
+    evicted session, or one from before a restart, is reloaded on its next request.
+    Reloads read on a per-thread WAL connection without holding the store lock; only a
+    session that still has writes queued is read on the writer, behind them. Per-session
+    state kept elsewhere registers with add_eviction_listener and is dropped along with
+    the session. Its methods block on SQLite reads, so async code calls them through
+    run_in_threadpool.
+    """
+
+    def __init__(self, db_path=Config.SESSION_DB_PATH, ttl=Config.SESSION_TTL_SECONDS,
+                 sweep_interval=Config.SESSION_SWEEP_INTERVAL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.write_errors = 0
+        self._sessions = OrderedDict()  # test_id -> (session, last used), least recently used first
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._db = None
+        self._queued = {}  # test_id -> statements queued on the writer
+        self._readers = threading.local()  # Read connection of each thread
+        self._schema_ready = False
+        # One thread owns every statement, so writes stay in order and reads see them
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='session-store')
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start_sweeping(self):
+        """Start the background sweep that evicts idle sessions"""
+        if self.sweep_interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='session-sweeper', daemon=True)
+        self._thread.start()
+
+    def shutdown(self):
+        """Stop the sweep and wait for queued writes"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """Wait until every queued write has reached SQLite"""
+        self._writer.submit(lambda: None).result()
+
+    def _run(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error sweeping interview sessions: {str(e)}")
+
+    def add_eviction_listener(self, listener):
+        """Call listener(test_id) whenever a session leaves memory or is deleted"""
+        self._listeners.append(listener)
+
+    @property
+    def db(self):
+        """The SQLite connection, opened on first use; None when persistence is disabled"""
+        if self._db is None and self.db_path:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.executescript(SCHEMA)
+            self._db = db
+        return self._db
+
+    def get(self, test_id):
+        """The session for test_id from memory or disk, or None"""
+        session, evicted = self._get(test_id)
+        self._notify(evicted)
+        return session
+
+    def start(self, test_id, domain=None, skill_level=None):
+        """The existing session for test_id, or a new one"""
+        session, evicted = self._get(test_id)
+        if session is None:
+            with self._lock:
+                session = self._cached(test_id)
+                if session is None:
+                    session = InterviewSession(test_id, domain, skill_level)
+                    self._write(test_id, 'INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)',
+                                (test_id, domain, skill_level, session.created_at, session.created_at))
+                    evicted += self._remember(session)
+        self._notify(evicted)
+        return session
+
+    def serve(self, session, question_ids):
+        """Record questions handed to the candidate; ids already served are ignored"""
+        with self._lock:
+            self._serve(session, question_ids)
+
+    def assign(self, session, question_ids):
+        """Serve question_ids only if nothing was served yet, atomically; returns the ids served"""
+        with self._lock:
+            if not session.served:
+                self._serve(session, question_ids)
+            return list(session.served)
+
+    def record_answer(self, session, question_id, answer, score=None):
+        """Store an answer and its score in [0, 1]; re-answering replaces the earlier answer"""
+        with self._lock:
+            session.answers.pop(question_id, None)
+            session.answers[question_id] = (answer, score)
+            self._write(session.test_id, 'INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)',
+                        (session.test_id, question_id, answer, score))
+            self._touch(session)
+
+    def sweep(self):
+        """Drop sessions idle for longer than the TTL from memory; they stay on disk"""
+        with self._lock:
+            evicted = self._evict(time.time())
+        self._notify(evicted)
+        return len(evicted)
+
+    def status(self):
+        return {
+            'active': len(self._sessions),
+            'ttl_seconds': self.ttl,
+            'persistent': bool(self.db_path),
+            'hits': self.hits,
+            'loads': self.loads,
+            'evictions': self.evictions,
+            'sweeping': self._thread is not None,
+            'write_errors': self.write_errors,
+            'queued_writes': sum(self._queued.values())
+        }
+
+    def _get(self, test_id):
+        """(session or None, test_ids evicted meanwhile); the lock is not held while reading the disk"""
+        with self._lock:
+            session = self._cached(test_id)
+            if session is not None:
+                self.hits += 1
+                return session, []
+
+        loaded = self._load(test_id)
+        if loaded is None:
+            return None, []
+        with self._lock:
+            # Another request may have loaded or started it meanwhile; everyone shares that one
+            session = self._cached(test_id)
+            if session is not None:
+                return session, []
+            self.loads += 1
+            return loaded, self._remember(loaded)
+
+    def _cached(self, test_id):
+        """The in-memory session, marked as just used, or None"""
+        entry = self._sessions.get(test_id)
+        if entry is None:
+            return None
+        self._sessions.move_to_end(test_id)
+        self._sessions[test_id] = (entry[0], time.time())
+        return entry[0]
+
+    def _remember(self, session):
+        now = time.time()
+        self._sessions[session.test_id] = (session, now)
+        self._sessions.move_to_end(session.test_id)
+        return self._evict(now)
+
+    def _evict(self, now):
+        """Evict sessions past the TTL and return their test_ids"""
+        evicted = []
+        # Least recently used first, so stop at the first session still in date
+        while self._sessions:
+            test_id, (_, last_used) = next(iter(self._sessions.items()))
+            if now - last_used <= self.ttl:
+                break
+            del self._sessions[test_id]
+            evicted.append(test_id)
+        self.evictions += len(evicted)
+        return evicted
+
+    def _notify(self, test_ids):
+        # Outside the store lock, so listeners may take their own locks or call back in
+        for test_id in test_ids:
+            for listener in self._listeners:
+                try:
+                    listener(test_id)
+                except Exception as e:
+                    print(f"Error dropping state of session {test_id}: {str(e)}")
+
+    def _serve(self, session, question_ids):
+        new_ids = [qid for qid in dict.fromkeys(question_ids) if qid not in session.served]
+        start = len(session.served)
+        session.served.extend(new_ids)
+        self._writemany(session.test_id, 'INSERT OR REPLACE INTO served VALUES (?, ?, ?)',
+                        [(session.test_id, start + i, qid) for i, qid in enumerate(new_ids)])
+        self._touch(session)
+
+    def _touch(self, session):
+        now = time.time()
+        if session.test_id in self._sessions:
+            self._sessions[session.test_id] = (session, now)
+            self._sessions.move_to_end(session.test_id)
+        self._write(session.test_id, 'UPDATE sessions SET updated_at = ? WHERE test_id = ?', (now, session.test_id))
+
+    def _load(self, test_id):
+        if not self.db_path:
+            return None
+        with self._lock:
+            queued = self._queued.get(test_id, 0)
+        if queued:
+            # Read behind this session's pending writes, so what comes back is complete
+            return self._writer.submit(lambda: self._read(self.db, test_id)).result()
+        return self._read(self._reader(), test_id)
+
+    def _reader(self):
+        """This thread's read connection; in WAL mode it never waits for the writer"""
+        db = getattr(self._readers, 'db', None)
+        if db is None:
+            if not self._schema_ready:
+                # The writer creates the file and tables once
+                self._writer.submit(lambda: self.db).result()
+                self._schema_ready = True
+            db = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._readers.db = db
+        return db
+
+    def _read(self, db, test_id):
+        row = db.execute(
+            'SELECT domain, skill_level, created_at FROM sessions WHERE test_id = ?', (test_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        session = InterviewSession(test_id, *row)
+        session.served = [qid for (qid,) in db.execute(
+            'SELECT question_id FROM served WHERE test_id = ? ORDER BY position', (test_id,))]
+        session.answers = {qid: (answer, score) for qid, answer, score in db.execute(
+            'SELECT question_id, answer, score FROM answers WHERE test_id = ? ORDER BY rowid', (test_id,))}
+        return session
+
+    def _write(self, test_id, sql, params):
+        # Called with the store lock held
+        if self.db_path:
+            self._queued[test_id] = self._queued.get(test_id, 0) + 1
+            self._writer.submit(self._execute, test_id, sql, params)
+
+    def _writemany(self, test_id, sql, rows):
+        if self.db_path and rows:
+            self._queued[test_id] = self._queued.get(test_id, 0) + 1
+            self._writer.submit(self._executemany, test_id, sql, rows)
+
+    def _execute(self, test_id, sql, params):
+        try:
+            self.db.execute(sql, params)
+        except Exception as e:
+            self.write_errors += 1
+            print(f"Error writing interview session: {str(e)}")
+        finally:
+            self._written(test_id)
+
+    def _executemany(self, test_id, sql, rows):
+        # One transaction, so a batch costs a single commit
+        try:
+            self.db.execute('BEGIN')
+            try:
+                self.db.executemany(sql, rows)
+            except Exception:
+                self.db.execute('ROLLBACK')
+                raise
+            self.db.execute('COMMIT')
+        except Exception as e:
+            self.write_errors += 1
+            print(f"Error writing interview session: {str(e)}")
+        finally:
+            self._written(test_id)
+
+    def _written(self, test_id):
+        with self._lock:
+            remaining = self._queued.pop(test_id) - 1
+            if remaining:
+                self._queued[test_id] = remaining
+
+def expand_answers(answers, bank):
+    """Fill question text, keywords and category from the bank for answers that only carry an id"""
+    expanded = []
+    for answer in answers:
+        question = bank.get(answer.get('question_id')) if answer.get('question_id') else None
+        if question is None:
+            if not answer.get('question'):
+                raise ValueError(f"Unknown question_id {answer.get('question_id')!r}")
+            expanded.append(answer)
+            continue
+        expanded.append({
+            'question': question['question'],
+            'expected_keywords': question['expected_keywords'],
+            'category': question['category'],
+            **answer
+        })
+    return expanded
+
+session_store = SessionStore()
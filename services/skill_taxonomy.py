@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+import re
+from functools import lru_cache
+
+# Domain (as named under data/) -> skill -> synonyms and spellings found in resumes.
+# Covers the five models.candidate.Domain values; a skill's own name always matches.
+# Spellings that are also ordinary English words or bare abbreviations are either
+# qualified ('Express.js', 'time series forecasting') or listed in CASE_SENSITIVE.
+SKILL_TAXONOMY = {
+    'ai_ml': {
+        'Machine Learning': ['ML', 'machine-learning'],
+        'Deep Learning': ['deep neural networks'],
+        'Artificial Intelligence': ['a.i.'],
+        'Neural Networks': ['neural network', 'artificial neural networks'],
+        'Natural Language Processing': ['nlp', 'text mining', 'language models'],
+        'Computer Vision': ['image processing', 'opencv', 'object detection', 'image recognition'],
+        'Large Language Models': ['llm', 'llms', 'generative ai', 'genai', 'prompt engineering'],
+        'Reinforcement Learning': [],
+        'Data Science': ['data scientist'],
+        'Statistics': ['statistical modeling', 'statistical modelling', 'hypothesis testing'],
+        'Python': ['python3', 'python 3'],
+        'R Programming': ['rstudio', 'r language', 'tidyverse', 'ggplot2'],
+        'TensorFlow': ['tensor flow', 'tf.keras'],
+        'PyTorch': [],
+        'Keras': [],
+        'scikit-learn': ['sklearn', 'scikit learn'],
+        'Pandas': [],
+        'NumPy': [],
+        'SciPy': [],
+        'Jupyter': ['jupyter notebook', 'jupyter notebooks', 'ipython'],
+        'Hugging Face': ['huggingface', 'hugging face transformers'],
+        'XGBoost': ['lightgbm', 'catboost', 'gradient boosting'],
+        'MLOps': ['mlflow', 'kubeflow', 'model deployment'],
+        'Apache Spark': ['Spark', 'pyspark', 'spark sql'],
+        'SQL': ['mysql', 'postgresql', 'postgres', 'sqlite', 't-sql'],
+        'Feature Engineering': [],
+        'Regression': ['linear regression', 'logistic regression'],
+        'Classification': ['classifier', 'classifiers'],
+        'Clustering': ['k-means', 'kmeans', 'dbscan'],
+        'Time Series': ['time series forecasting', 'arima'],
+    },
+    'web_dev': {
+        'HTML': ['html5'],
+        'CSS': ['css3', 'sass', 'scss'],
+        'JavaScript': ['JS', 'ecmascript', 'es6', 'vanilla js'],
+        'TypeScript': [],
+        'React': ['react.js', 'reactjs', 'react js', 'react native', 'redux'],
+        'Angular': ['angularjs', 'angular.js'],
+        'Vue': ['vue.js', 'vuejs', 'nuxt', 'nuxt.js'],
+        'Svelte': ['sveltekit'],
+        'Next.js': ['nextjs'],
+        'Node.js': ['nodejs', 'node js'],
+        'Express.js': ['expressjs', 'express js'],
+        'jQuery': [],
+        'Bootstrap': [],
+        'Tailwind CSS': ['tailwind', 'tailwindcss'],
+        'Frontend Development': ['frontend', 'front-end', 'front end'],
+        'Backend Development': ['backend', 'back-end', 'back end'],
+        'Full Stack Development': ['full stack', 'full-stack', 'fullstack'],
+        'REST APIs': ['restful', 'rest api', 'restful apis'],
+        'GraphQL': [],
+        'Django': [],
+        'Flask': [],
+        'FastAPI': [],
+        'PHP': ['laravel', 'wordpress'],
+        'Ruby on Rails': ['ror', 'rails framework'],
+        'Java': ['spring boot', 'j2ee'],
+        'C#': ['.net', 'asp.net', 'dotnet'],
+        'MongoDB': ['mongo', 'mongoose'],
+        'Webpack': ['vite', 'babel'],
+        'Git': ['github', 'gitlab', 'version control'],
+        'Docker': ['kubernetes', 'k8s', 'containerization'],
+        'Responsive Design': ['responsive web design', 'mobile-first'],
+        'Web Accessibility': ['a11y', 'wcag'],
+        'Software Testing': ['jest', 'cypress', 'unit testing', 'selenium', 'test automation'],
+    },
+    'sales': {
+        'B2B Sales': ['b2b'],
+        'B2C Sales': ['b2c', 'retail sales'],
+        'Lead Generation': ['lead gen', 'prospecting', 'cold calling', 'cold outreach'],
+        'Account Management': ['key account management', 'account manager', 'client relationship management'],
+        'Business Development': ['business development executive'],
+        'Negotiation': ['negotiating', 'deal closing', 'closing deals'],
+        'CRM': ['salesforce', 'hubspot', 'zoho crm', 'pipedrive'],
+        'Sales Pipeline Management': ['pipeline management', 'sales pipeline', 'sales funnel'],
+        'Sales Forecasting': ['revenue forecasting'],
+        'Customer Relationship Management': ['customer relationships', 'relationship building'],
+        'Consultative Selling': ['solution selling', 'spin selling', 'value selling'],
+        'Inside Sales': ['telesales'],
+        'Field Sales': ['territory management', 'territory sales'],
+        'Presentation Skills': ['sales presentations', 'product demos', 'product demonstrations'],
+        'Quota Attainment': ['sales targets', 'sales quota', 'target achievement'],
+        'Upselling': ['cross-selling', 'cross selling', 'upsell'],
+        'Customer Retention': ['churn reduction', 'contract renewals', 'subscription renewals'],
+        'Channel Sales': ['partner sales', 'distributor management'],
+    },
+    'business': {
+        'Business Analysis': ['business analyst'],
+        'Requirements Gathering': ['requirements elicitation', 'requirements analysis', 'brd', 'frd'],
+        'Stakeholder Management': ['stakeholder engagement', 'stakeholder communication'],
+        'Process Improvement': ['process optimization', 'process mapping', 'bpmn', 'lean six sigma', 'six sigma'],
+        'Data Analysis': ['data analytics', 'data analyst'],
+        'Microsoft Excel': ['Excel', 'ms excel', 'spreadsheets', 'vlookup', 'pivot tables'],
+        'Power BI': ['powerbi'],
+        'Tableau': [],
+        'Business Intelligence': ['dashboards', 'bi reporting'],
+        'Agile': ['scrum', 'kanban', 'sprint planning'],
+        'JIRA': ['confluence'],
+        'User Stories': ['use cases', 'acceptance criteria'],
+        'Gap Analysis': ['swot', 'swot analysis', 'root cause analysis'],
+        'Financial Analysis': ['financial modeling', 'financial modelling', 'budget planning'],
+        'Project Management': ['pmp', 'prince2', 'project planning'],
+        'UML': ['uml diagrams', 'flowcharts', 'wireframes', 'wireframing'],
+        'KPIs': ['kpi', 'okrs'],
+        'Market Research': ['competitive analysis', 'competitor analysis'],
+        'Product Management': ['product owner', 'roadmapping', 'product roadmap'],
+    },
+    'marketing': {
+        'Digital Marketing': ['online marketing', 'internet marketing'],
+        'SEO': ['search engine optimization', 'search engine optimisation'],
+        'SEM': ['search engine marketing', 'google ads', 'adwords', 'ppc', 'pay per click'],
+        'Social Media Marketing': ['social media strategy', 'smm', 'instagram marketing', 'linkedin marketing'],
+        'Content Marketing': ['content strategy', 'content creation', 'copywriting', 'blogging'],
+        'Email Marketing': ['mailchimp', 'email campaigns', 'newsletters'],
+        'Marketing Automation': ['marketo', 'pardot', 'hubspot marketing'],
+        'Google Analytics': ['ga4', 'web analytics'],
+        'Brand Management': ['branding', 'brand strategy', 'brand awareness'],
+        'Campaign Management': ['marketing campaigns', 'campaign planning'],
+        'Market Segmentation': ['customer segmentation', 'buyer personas'],
+        'Conversion Rate Optimization': ['cro', 'a/b testing', 'ab testing', 'landing pages'],
+        'Public Relations': ['media relations', 'press releases'],
+        'Influencer Marketing': ['influencer outreach'],
+        'Performance Marketing': ['paid media', 'paid social', 'facebook ads', 'meta ads'],
+        'Product Marketing': ['go-to-market', 'gtm strategy', 'product launches', 'product positioning'],
+        'Affiliate Marketing': ['affiliate programs'],
+        'Event Marketing': ['event management', 'trade shows'],
+    },
+}
+
+# Spellings matched only with exactly this capitalization: "React" is the library,
+# "react to feedback" is not, and "excel" or "spark" in running text is no skill at all
+CASE_SENSITIVE = frozenset({
+    'ML', 'JS', 'React', 'Angular', 'Bootstrap', 'Flask', 'Pandas', 'Spark', 'Excel',
+})
+
+# Domain returned when no skill points anywhere, as before
+DEFAULT_DOMAIN = 'ai_ml'
+
+class SkillMatcher:
+    """Finds every taxonomy skill in a text in one left-to-right regex pass.
+
+    All spellings are merged into a prefix trie and compiled into a single pattern,
+    so at each position the regex walks at most one trie path, as long as the
+    longest spelling. Matching cost is linear in the text length however many
+    skills and synonyms the taxonomy holds. CASE_SENSITIVE spellings get a second,
+    equally small pattern run over the text with its capitalization kept.
+    """
+
+    def __init__(self, taxonomy=SKILL_TAXONOMY, case_sensitive=CASE_SENSITIVE):
+        self.skills = {}  # spelling, lowercased -> canonical skill
+        self.exact = {}  # case-sensitive spelling -> canonical skill
+        self.domains = {}  # canonical skill, lowercased -> domains
+        for domain, skills in taxonomy.items():
+            for skill, synonyms in skills.items():
+                self.domains.setdefault(skill.lower(), set()).add(domain)
+                for spelling in [skill] + synonyms:
+                    if spelling in case_sensitive:
+                        self.exact.setdefault(_collapse(spelling), skill)
+                    else:
+                        self.skills.setdefault(_normalize(spelling), skill)
+
+        self.pattern = _compile(self.skills, 'a-z0-9')
+        self.exact_pattern = _compile(self.exact, 'A-Za-z0-9') if self.exact else None
+
+    def find(self, text):
+        """Canonical skills mentioned in text, in order of first mention"""
+        text = _collapse(text)
+        # Lowercasing keeps offsets, so matches from both patterns sort by position
+        matches = [(match.start(), self.skills[match.group(1)]) for match in self.pattern.finditer(text.lower())]
+        if self.exact_pattern is not None:
+            matches += [(match.start(), self.exact[match.group(1)]) for match in self.exact_pattern.finditer(text)]
+        found = {}
+        for _, skill in sorted(matches, key=lambda match: match[0]):
+            found.setdefault(skill, None)
+        return list(found)
+
+    def domain_counts(self, skills):
+        """domain -> number of skills that belong to it; accepts canonical names or synonyms"""
+        counts = {}
+        for skill in skills:
+            canonical = self.exact.get(_collapse(skill)) or self.skills.get(_normalize(skill), skill)
+            for domain in self.domains.get(canonical.lower(), ()):
+                counts[domain] = counts.get(domain, 0) + 1
+        return counts
+
+def _collapse(text):
+    return ' '.join(str(text).split())
+
+def _normalize(text):
+    return _collapse(text).lower()
+
+def _compile(spellings, word_chars):
+    trie = {}
+    for spelling in spellings:
+        node = trie
+        for char in spelling:
+            node = node.setdefault(char, {})
+        node[''] = True
+    # Skill spellings may end in symbols (c#, node.js), so boundaries are alphanumeric only
+    return re.compile(rf'(?<![{word_chars}])(' + _trie_pattern(trie) + rf')(?![{word_chars}])')
+
+def _trie_pattern(node):
+    """Regex for a trie node; longer continuations are tried first so the longest spelling wins"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        return '(?:' + body + ')?'
+    return body
+
+@lru_cache(maxsize=1)
+def get_skill_matcher():
+    """The shared matcher, compiled on first use"""
+    return SkillMatcher()
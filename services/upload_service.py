@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import threading
+from uuid import uuid4
+import magic
+
+CHUNK_SIZE = 64 * 1024
+
+class UploadTooLarge(ValueError):
+    """Raised as soon as an upload crosses its size limit"""
+
+class UnsupportedFileType(ValueError):
+    """Raised when the sniffed MIME type is not one the caller accepts"""
+
+class StoredUpload:
+    """An ingested upload: where it was written, its size, SHA-256 and sniffed MIME type"""
+
+    def __init__(self, path, size, sha256, mime_type):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.mime_type = mime_type
+
+class UploadService:
+    """Chunked upload ingest with one shared libmagic detector.
+
+    Uploads are read from the request's spooled temporary file in CHUNK_SIZE pieces, so
+    no upload is ever held in memory as a whole. Size is checked and the SHA-256 updated
+    per chunk, and the MIME type is sniffed from the first chunk only.
+    """
+
+    def __init__(self):
+        # Building a detector loads the magic database, so it is done once;
+        # libmagic handles are not thread-safe, hence the lock
+        self._detector = magic.Magic(mime=True)
+        self._detector_lock = threading.Lock()
+
+    def sniff(self, head):
+        with self._detector_lock:
+            return self._detector.from_buffer(head)
+
+    def store(self, source, dest_dir, extension, max_bytes, allowed_mime_types=None, content_addressed=False):
+        """Copy source into dest_dir chunk by chunk; nothing is left behind if it is rejected.
+
+        Content-addressed files are named by their SHA-256, so storing the same bytes
+        again reuses the existing file.
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        partial = os.path.join(dest_dir, f"{uuid4()}{extension}.part")
+        try:
+            with open(partial, 'wb') as dest:
+                size, sha256, mime_type = self._read(source, max_bytes, allowed_mime_types, dest.write)
+            filepath = os.path.join(dest_dir, f"{sha256 if content_addressed else uuid4()}{extension}")
+            if content_addressed and os.path.exists(filepath):
+                os.remove(partial)
+            else:
+                # Only complete, accepted files ever appear under their final name
+                os.replace(partial, filepath)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        return StoredUpload(filepath, size, sha256, mime_type)
+
+    def copy(self, source, dest, max_bytes, allowed_mime_types=None):
+        """Copy source into an open file chunk by chunk, stopping as soon as it passes max_bytes"""
+        size, sha256, mime_type = self._read(source, max_bytes, allowed_mime_types, dest.write)
+        dest.seek(0)
+        return StoredUpload(None, size, sha256, mime_type)
+
+    def scan(self, source, max_bytes, allowed_mime_types=None):
+        """Check and hash source without copying it, then rewind it for the caller"""
+        size, sha256, mime_type = self._read(source, max_bytes, allowed_mime_types)
+        source.seek(0)
+        return StoredUpload(None, size, sha256, mime_type)
+
+    def _read(self, source, max_bytes, allowed_mime_types, write=None):
+        source.seek(0)
+        digest = hashlib.sha256()
+        size = 0
+        mime_type = None
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"File size too large. Maximum size is {max_bytes // (1024 * 1024)}MB")
+            if mime_type is None:
+                mime_type = self.sniff(chunk)
+                if allowed_mime_types is not None and mime_type not in allowed_mime_types:
+                    raise UnsupportedFileType(f"Unsupported file type {mime_type}")
+            digest.update(chunk)
+            if write is not None:
+                write(chunk)
+        if mime_type is None:
+            raise ValueError("Uploaded file is empty")
+        return size, digest.hexdigest(), mime_type
+
+upload_service = UploadService()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""Process pools whose workers import only their own worker module.
+
+With the spawn start method every child re-imports the parent's __main__; under
+`python run.py` that is the whole app, routes and proctoring models included. Pools
+built here have each child run a small worker module as its __main__ instead.
+"""
+import importlib.util
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+def spawn_pool(workers, worker_module, initargs=(), context=None):
+    """ProcessPoolExecutor running worker_module.init_worker(*initargs) in every worker, all started now.
+
+    worker_module must also provide a no-op started() job.
+    """
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context or multiprocessing.get_context('spawn'),
+        initializer=worker_module.init_worker,
+        initargs=initargs
+    )
+    # Processes are started on demand; one job per worker starts them all now, while
+    # the worker module stands in for __main__
+    with worker_main(worker_module.__name__):
+        for _ in range(workers):
+            executor.submit(worker_module.started)
+    return executor
+
+@contextmanager
+def worker_main(module_name):
+    """Have processes spawned inside this block run module_name as their __main__"""
+    main = sys.modules['__main__']
+    spec = getattr(main, '__spec__', None)
+    main.__spec__ = importlib.util.find_spec(module_name)
+    try:
+        yield
+    finally:
+        main.__spec__ = spec
+
+def describe_worker(pause=0.0):
+    """(pid, module run as __main__, app modules imported) of the calling process, for check_worker_processes.py"""
+    # A short pause keeps one idle worker from answering every probe
+    time.sleep(pause)
+    main = sys.modules.get('__mp_main__') or sys.modules['__main__']
+    spec = getattr(main, '__spec__', None)
+    app_modules = sorted(name for name in sys.modules if name == 'run' or name.startswith('api.'))
+    return os.getpid(), spec.name if spec is not None else getattr(main, '__file__', None), app_modules
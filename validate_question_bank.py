@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import sys
+from config import Config
+from services.question_bank import validate_questions
+
+def validate_question_bank():
+    try:
+        questions = validate_questions()
+    except ValueError as e:
+        print(str(e))
+        sys.exit(1)
+    print(f"{len(questions)} questions in {Config.QUESTION_DATA_DIR} are valid")
+
+if __name__ == "__main__":
+    validate_question_bank()